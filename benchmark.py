@@ -0,0 +1,103 @@
+"""
+Benchmarks for the hot paths used by the chunk storages. Every benchmark
+runs on a small box at the corner of a chunk, so that it finishes in a few
+seconds, and prints the number of curves per second of each variant.
+"""
+
+import itertools
+from time import perf_counter
+from typing import Callable
+
+from src.chunk_storage import ChunkStorage, TorsionStorage
+from src.elliptic_curves import EllipticCurve, Point, SingularCurveError
+from src.elliptic_curves.elliptic_curve import TORSION_STRATEGIES
+
+
+def cells_of(storage: ChunkStorage, target_chunk: list[int], side: int) -> list:
+    """Returns the first side^n cells of a chunk of the storage"""
+    cr = storage.chunk_range
+    ranges = [
+        range(target_chunk[i] * cr[i], target_chunk[i] * cr[i] + min(side, cr[i]))
+        for i in range(len(cr))
+    ]
+    return list(itertools.product(*ranges))
+
+
+def time_cells(name: str, cells: list, calculate: Callable) -> float:
+    start = perf_counter()
+    for cell in cells:
+        calculate(cell)
+    elapsed = perf_counter() - start
+    print(f"{name.ljust(30)} {elapsed:8.2f}s {len(cells) / elapsed:10.0f} curves/s")
+    return elapsed
+
+
+class CheckedEllipticCurve(EllipticCurve):
+    """Asserts both operands on every addition, as add used to"""
+
+    def _add(self, p_1: Point, p_2: Point) -> Point:
+        assert self.is_on_the_curve(p_1)
+        assert self.is_on_the_curve(p_2)
+        return super()._add(p_1, p_2)
+
+
+def torsion_with(
+    curve_class: type[EllipticCurve], strategy: str | None = None
+) -> Callable:
+    def calculate(cell: tuple[int, int, int]) -> str:
+        try:
+            return curve_class(*cell, torsion_strategy=strategy).torsion_name
+        except SingularCurveError:
+            return "-"
+
+    return calculate
+
+
+def benchmark_point_validation(target_chunk: list[int], side: int) -> None:
+    """Torsion with per-addition assertions against the trusted fast path"""
+    print(f"Point validation, TorsionStorage chunk {target_chunk}, side {side}")
+    cells = cells_of(TorsionStorage(), target_chunk, side)
+    checked = time_cells("checked additions", cells, torsion_with(CheckedEllipticCurve))
+    trusted = time_cells("trusted additions", cells, torsion_with(EllipticCurve))
+    print(f"Speedup: {checked / trusted:.2f}x\n")
+
+
+def benchmark_torsion_strategies(side: int) -> None:
+    """
+    Compares the torsion engines on a box at the corner of every saved
+    TorsionStorage chunk, checking both against the stored results.
+    Chunks are grouped by their distance to the origin.
+    """
+    print(f"Torsion strategies, every saved TorsionStorage chunk, side {side}")
+    storage = TorsionStorage()
+    times: dict[int, dict[str, float]] = {}
+    n_cells: dict[int, int] = {}
+    for chunk in sorted(storage.get_all_chunks()):
+        stored = {
+            tuple(args): result
+            for result, args_list in storage.get_chunk_data(chunk).items()
+            for args in args_list
+        }
+        cells = cells_of(storage, chunk, side)
+        ring = max(abs(c) for c in chunk)
+        n_cells[ring] = n_cells.get(ring, 0) + len(cells)
+        for strategy in TORSION_STRATEGIES:
+            calculate = torsion_with(EllipticCurve, strategy)
+            start = perf_counter()
+            results = [calculate(cell) for cell in cells]
+            elapsed = perf_counter() - start
+            times.setdefault(ring, {}).setdefault(strategy, 0.0)
+            times[ring][strategy] += elapsed
+            for cell, result in zip(cells, results):
+                assert result == stored.get(cell, "0"), (strategy, cell, result)
+    for ring, ring_times in sorted(times.items()):
+        print(f"Chunks at distance {ring} ({n_cells[ring]} curves)")
+        for strategy, elapsed in ring_times.items():
+            speed = n_cells[ring] / elapsed
+            print(f"  {strategy.ljust(28)} {elapsed:8.2f}s {speed:10.0f} curves/s")
+    print()
+
+
+if __name__ == "__main__":
+    benchmark_point_validation(target_chunk=[0, 0, 0], side=20)
+    benchmark_torsion_strategies(side=6)
@@ -5,9 +5,7 @@ import pygame
 from sympy import symbols
 
 from src.elliptic_curves import EllipticCurve, SingularCurveError
-from src.elliptic_curves.counting_points_mod_p import (
-    count_points_mod_p_naive_weierstrass_form,
-)
+from src.elliptic_curves.counting_points_mod_p import has_two_torsion_mod_p
 from src.utils.rational_integers import divisors_of, square_free_divisors_of
 
 pygame.init()
@@ -18,8 +16,8 @@ clock = pygame.time.Clock()
 
 
 def correction_term_is_of_first_type(e: EllipticCurve, p: int) -> bool:
-    solutions = count_points_mod_p_naive_weierstrass_form(e, p)
-    return (p + 1 - len(solutions)) % 2 == 0
+    """p + 1 - #E_p is even exactly when E_p has a point of order 2"""
+    return has_two_torsion_mod_p(e.a, e.b, e.c, p)
 
 
 class Square:
@@ -44,7 +42,7 @@ class Square:
 
 screen.fill((0, 0, 0))
 PIXEL_SIZE = 6
-PRIME = 91
+PRIME = 89
 square = Square(PRIME, 0, 0)
 
 running = True
@@ -17,23 +17,25 @@ integers p, q such that one of the following hold.
 
 This application calculates pi, p and q for a large amount of good primes in 
 ascending order and draws on the screen a path passing through all the points pi.
+The terms are calculated by a background thread and drawn as they arrive, so
+only the last point of the path is kept in memory.
 """
 
+import itertools
+import threading
 from math import sqrt
-from pprint import pprint
+from queue import Empty, Full, Queue
+from typing import Iterator
 
 import pygame
 from sympy import primerange
 
+from src.chunk_storage import FrobeniusStorage
 from src.elliptic_curves import EllipticCurve
-from src.elliptic_curves.counting_points_mod_p import (
-    count_points_mod_p_naive_weierstrass_form,
-)
 
 # ==================== APP CONFIG ======================= #
 
 pygame.init()
-zoom = 50
 width, height = 1920, 1080
 screen = pygame.display.set_mode((width, height))
 
@@ -43,31 +45,56 @@ pygame.font.init()
 # ======================================================= #
 
 e = EllipticCurve(0, -1, -112)
-max_prime = 500
-
-good_primes = [p for p in primerange(max_prime) if e.discriminant % p != 0 and p > 5]
-n_solutions = {  # number of solutions of good prime reduction
-    p: len(count_points_mod_p_naive_weierstrass_form(e, p)) for p in good_primes
-}
-correction_terms: dict[int, tuple[float, float]] = {}
-for p, solutions_mod_p in n_solutions.items():
-    real_part = (p + 1 - solutions_mod_p) / 2
-    imag_part = sqrt(p - real_part**2)
-    correction_terms[p] = (real_part, imag_part)
-
-lattice_points: dict[int, tuple[float, float, str]] = {}
-for p, term in correction_terms.items():
-    if term[0].is_integer():
-        assert round(term[1] ** 2, 2).is_integer()
-        lattice_points[p] = (int(term[0]), int(term[1] ** 2), "not")
-    else:
-        assert round((2 * term[1]) ** 2, 2).is_integer()
-        assert round(2 * term[0], 2).is_integer()
-        lattice_points[p] = (int(2 * term[0]), int((2 * term[1]) ** 2), "divided")
-
-# print(len([t for t in lattice_points.values() if t[2] == "not"]) / len(lattice_points))
-# pprint(lattice_points)
-# exit()
+max_prime = 2 * 10**7
+zoom = height / sqrt(max_prime)
+max_terms_per_frame = 2000
+
+
+def correction_terms(
+    e: EllipticCurve, max_prime: int
+) -> Iterator[tuple[int, tuple[float, float], tuple[int, int, str]]]:
+    """
+    Lazily yields (p, pi, lattice point) for the good primes p > 5 in
+    ascending order. The traces are read from storage when they were
+    counted before, and counted and appended to it otherwise.
+    """
+    storage = FrobeniusStorage()
+    for p, a_p, bad in storage.iterate_traces((e.a, e.b, e.c), primerange(max_prime)):
+        if bad or p <= 5:
+            continue
+        real_part = a_p / 2
+        imag_part = sqrt(p - real_part**2)
+        if a_p % 2 == 0:
+            lattice_point = (a_p // 2, p - (a_p // 2) ** 2, "not")
+        else:
+            lattice_point = (a_p, 4 * p - a_p**2, "divided")
+        yield p, (real_part, imag_part), lattice_point
+
+
+def produce(terms: Iterator, queue: Queue, stop: threading.Event) -> None:
+    """
+    Moves the terms into the queue, which blocks while it is full, until
+    the stop event is set. The worker only stops between two terms, so
+    it never leaves a half written line in the storage.
+    """
+    for term in itertools.chain(terms, [None]):
+        while not stop.is_set():
+            try:
+                queue.put(term, timeout=0.1)
+                break
+            except Full:
+                pass
+        if stop.is_set():
+            return
+
+
+# The worker stays at most queue.maxsize terms ahead of the drawing
+queue: Queue = Queue(maxsize=4 * max_terms_per_frame)
+stop = threading.Event()
+producer = threading.Thread(
+    target=produce, args=(correction_terms(e, max_prime), queue, stop)
+)
+producer.start()
 
 # Drawing the tree
 screen.fill((255, 255, 255))
@@ -76,26 +103,42 @@ text = str(e).replace("^3", "³").replace("^2", "²")
 text_sfc = font.render(text, True, (0, 0, 0))
 screen.blit(text_sfc, (10, 10))
 
-for i in range(len(good_primes) - 1):
-    term_start = correction_terms[good_primes[i]]
-    term_end = correction_terms[good_primes[i + 1]]
-    line_start = (width // 2 + term_start[0] * zoom, height - term_start[1] * zoom)
-    line_end = (width // 2 + term_end[0] * zoom, height - term_end[1] * zoom)
-    pygame.draw.line(
-        screen,
-        (int(255 - i * 255 / (len(good_primes) - 2)), 0, 0),
-        line_start,
-        line_end,
-        width=2,
-    )
-
-pygame.display.update()
+previous_term: tuple[float, float] | None = None
+finished = False
 
 while True:
     clock.tick(30)
 
+    for _ in range(0 if finished else max_terms_per_frame):
+        try:
+            item = queue.get_nowait()
+        except Empty:
+            break
+        if item is None:
+            finished = True
+            break
+        p, term, _ = item
+        if previous_term is not None:
+            line_start = (
+                width // 2 + previous_term[0] * zoom,
+                height - previous_term[1] * zoom,
+            )
+            line_end = (width // 2 + term[0] * zoom, height - term[1] * zoom)
+            pygame.draw.line(
+                screen,
+                (int(255 - p * 255 / max_prime), 0, 0),
+                line_start,
+                line_end,
+                width=2,
+            )
+        previous_term = term
+
+    pygame.display.update()
+
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            stop.set()
+            producer.join()
             pygame.quit()
             exit()
         if event.type == pygame.MOUSEBUTTONDOWN:
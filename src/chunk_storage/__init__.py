@@ -1,3 +1,4 @@
 from .chunk_storage import ChunkStorage
+from .frobenius_storage import FrobeniusStorage
 from .rank_storage import RankStorage
 from .torsion_storage import TorsionStorage
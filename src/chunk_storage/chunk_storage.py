@@ -7,6 +7,8 @@ from typing import Any
 
 from tqdm import tqdm
 
+from ..utils.rational_integers import install_prime_sieve
+
 
 class ChunkStorage(ABC):
     def __init__(
@@ -21,6 +23,66 @@ class ChunkStorage(ABC):
     def _calculate(self, variables: list[int]) -> Any:
         pass
 
+    def _factorization_bound(self, ranges: list[range]) -> int:
+        """
+        Returns an upper bound for the absolute value of the integers
+        factored while calculating the given ranges. A prime sieve up
+        to this bound is built once per chunk and shared by the workers.
+        Storages that do not factor integers may keep the default 0.
+        """
+        return 0
+
+    def _canonical_form(self, variables: tuple[int, ...]) -> tuple[int, ...]:
+        """
+        Returns a representative of the class of coordinates which
+        share the same result as the given one, so that each class is
+        calculated only once. By default every class is a singleton.
+        """
+        return variables
+
+    def _is_final(self, result: Any) -> bool:
+        """
+        Checks if a saved result can be reused, or if it should be
+        calculated again when its chunk is recalculated. By default
+        every result is final.
+        """
+        return True
+
+    def _initialize_worker(self, sieve_limit: int) -> None:
+        """
+        Runs once in each worker process before any calculation. By
+        default it installs the prime sieve of the chunk.
+        """
+        install_prime_sieve(sieve_limit)
+
+    def _stored_results(self, keys: list[tuple[int, ...]]) -> dict[tuple, Any]:
+        """
+        Returns the results of the given coordinates that can be read
+        from the chunks already saved to storage. Coordinates missing
+        from a saved chunk have an ignored value, which can only be
+        recovered when there is a single value to ignore. Results which
+        are not final are left out, so that they are calculated again.
+        """
+        saved_chunks = {tuple(c) for c in self.get_all_chunks()}
+        chunk_data: dict[tuple, dict[tuple, Any]] = {}
+        stored: dict[tuple, Any] = {}
+        for key in keys:
+            chunk = tuple(k // r for k, r in zip(key, self.chunk_range))
+            if chunk not in saved_chunks:
+                continue
+            if chunk not in chunk_data:
+                chunk_data[chunk] = {
+                    tuple(args): result
+                    for result, args_list in self.get_chunk_data(list(chunk)).items()
+                    for args in args_list
+                }
+            if key in chunk_data[chunk]:
+                if self._is_final(chunk_data[chunk][key]):
+                    stored[key] = chunk_data[chunk][key]
+            elif len(self.ignore_values) == 1:
+                stored[key] = self.ignore_values[0]
+        return stored
+
     def _iterate(self, args) -> Any:
         """
         Calculates one coordinate of the chunk and stores its value in the
@@ -56,18 +118,33 @@ class ChunkStorage(ABC):
         n_variables = len(cr)
         ranges = [range(nc[i] * cr[i], (nc[i] + 1) * cr[i]) for i in range(n_variables)]
         combinations = list(itertools.product(*ranges))
-        results: dict[str, list[int]] = {}
-        with multiprocessing.Pool(n_processes) as pool:
+        classes: dict[tuple[int, ...], list[tuple[int, ...]]] = {}
+        for args in combinations:
+            classes.setdefault(self._canonical_form(args), []).append(args)
+        class_results = self._stored_results(list(classes))
+        missing = [key for key in classes if key not in class_results]
+        # Forked workers inherit the sieve, spawned ones rebuild it
+        sieve_limit = self._factorization_bound(ranges)
+        install_prime_sieve(sieve_limit)
+        with multiprocessing.Pool(
+            n_processes, initializer=self._initialize_worker, initargs=(sieve_limit,)
+        ) as pool:
             for output in tqdm(
-                pool.imap_unordered(self._iterate, combinations),
-                total=len(combinations),
+                pool.imap_unordered(self._iterate, missing),
+                total=len(missing),
                 mininterval=1.0,
             ):
                 if output is not None:
-                    args, result = output
-                    if result not in results:
-                        results[result] = []
-                    results[result].append(args)
+                    key, result = output
+                    class_results[key] = result
+        results: dict[str, list[tuple[int, ...]]] = {}
+        for key, members in classes.items():
+            result = class_results.get(key)
+            if result is None or result in self.ignore_values:
+                continue
+            if result not in results:
+                results[result] = []
+            results[result].extend(members)
         with open(self.get_chunk_path(nc), "w") as f:
             json.dump(dict(results), f)
 
@@ -0,0 +1,166 @@
+import itertools
+import json
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from src.elliptic_curves.counting_points_mod_p import (
+    BSGS_THRESHOLD,
+    discriminants_mod_p,
+    frobenius_traces,
+    number_of_points_mod_p,
+)
+
+Curve = tuple[int, int, int]
+
+
+class FrobeniusStorage:
+    """
+    Stores the Frobenius traces a_p = p + 1 - #E(F_p) of the curves
+    E : y² = x³ + ax² + bx + c, with one file per curve. Each bulk write
+    appends a single JSON line mapping primes to traces, so the files only
+    grow, and extending a prime range only computes the missing entries.
+    """
+
+    def __init__(self, path: Path = Path("./data/frobenius")) -> None:
+        self.path = path
+
+    def frobenius_traces(
+        self,
+        coefficients: list[Curve] | np.ndarray,
+        primes: Iterable[int],
+    ) -> tuple[list[int], np.ndarray, np.ndarray]:
+        """
+        Same as counting_points_mod_p.frobenius_traces, but the traces
+        already saved are read from storage, and the missing ones are
+        calculated together and appended to it.
+        """
+        coefficients = np.asarray(coefficients, dtype=np.int64).reshape(-1, 3)
+        primes = list(primes)
+        curves = [tuple(int(k) for k in row) for row in coefficients]
+        stored = {curve: self.get_curve_data(curve) for curve in set(curves)}
+        self._calculate_missing(stored, primes)
+        traces = np.array(
+            [[stored[curve][p] for p in primes] for curve in curves], dtype=np.int64
+        ).reshape(len(curves), len(primes))
+        bad = np.zeros(traces.shape, dtype=bool)
+        for j, p in enumerate(primes):
+            bad[:, j] = (p == 2) | (discriminants_mod_p(coefficients, p) == 0)
+        return primes, traces, bad
+
+    def iterate_traces(
+        self, curve: Curve, primes: Iterable[int], block_size: int = 1024
+    ) -> Iterator[tuple[int, int, bool]]:
+        """
+        Lazily yields (p, a_p, bad) for the given primes, which may be an
+        unbounded generator. The primes are taken in blocks, whose missing
+        traces are appended to storage as soon as they are calculated.
+        The stored lines are indexed by their range of primes, so only the
+        traces of the current block are held in memory.
+        """
+        index = [
+            (offset, min(traces), max(traces))
+            for offset, traces in self._stored_lines(curve)
+            if traces
+        ]
+        coefficients = np.array([curve], dtype=np.int64)
+        primes = iter(primes)
+        while block := list(itertools.islice(primes, block_size)):
+            low, high = min(block), max(block)
+            offsets = [offset for offset, lo, hi in index if lo <= high and low <= hi]
+            stored = {curve: self._read_lines(curve, offsets, set(block))}
+            self._calculate_missing(stored, block)
+            for p in block:
+                bad = p == 2 or bool(discriminants_mod_p(coefficients, p)[0] == 0)
+                yield p, stored[curve][p], bad
+
+    def _calculate_missing(
+        self, stored: dict[Curve, dict[int, int]], primes: list[int]
+    ) -> None:
+        """
+        Adds the traces of the given primes missing from the stored ones,
+        counting the small primes of every curve in one batched table,
+        and appends them to storage.
+        """
+        missing = {
+            curve: [p for p in primes if p not in traces]
+            for curve, traces in stored.items()
+        }
+        incomplete = [curve for curve in stored if missing[curve]]
+        missing_primes = sorted({p for curve in incomplete for p in missing[curve]})
+        small_primes = [p for p in missing_primes if p <= BSGS_THRESHOLD]
+        if incomplete and small_primes:
+            _, table, _ = frobenius_traces(incomplete, small_primes)
+            for i, curve in enumerate(incomplete):
+                for j, p in enumerate(small_primes):
+                    if p not in stored[curve]:
+                        stored[curve][p] = int(table[i, j])
+        for curve in incomplete:
+            for p in missing[curve]:
+                if p > BSGS_THRESHOLD:
+                    stored[curve][p] = p + 1 - number_of_points_mod_p(*curve, p)
+            self.save_curve_data(curve, {p: stored[curve][p] for p in missing[curve]})
+
+    def get_curve_data(self, curve: Curve) -> dict[int, int]:
+        traces: dict[int, int] = {}
+        for _, line in self._stored_lines(curve):
+            traces.update(line)
+        return traces
+
+    def _stored_lines(self, curve: Curve) -> Iterator[tuple[int, dict[int, int]]]:
+        """
+        Yields the byte offset and the traces of each line in the file of
+        the curve. A line cut short by an interrupted append cannot be
+        decoded and is skipped, so its traces are calculated again.
+        """
+        curve_path = self.get_curve_path(curve)
+        if not curve_path.exists():
+            return
+        with open(curve_path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    traces = json.loads(line)
+                except json.JSONDecodeError:
+                    traces = None
+                if traces is not None:
+                    yield offset, {int(p): a_p for p, a_p in traces.items()}
+                offset += len(line)
+
+    def _read_lines(
+        self, curve: Curve, offsets: list[int], primes: set[int]
+    ) -> dict[int, int]:
+        """Reads the traces of the given primes from the lines at the offsets"""
+        traces: dict[int, int] = {}
+        if not offsets:
+            return traces
+        with open(self.get_curve_path(curve), "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                line = json.loads(f.readline())
+                traces.update({int(p): line[p] for p in line if int(p) in primes})
+        return traces
+
+    def save_curve_data(self, curve: Curve, traces: dict[int, int]) -> None:
+        """Appends the given traces to the file of the curve"""
+        if not traces:
+            return
+        if not self.path.is_dir():
+            self.path.mkdir()
+        curve_path = self.get_curve_path(curve)
+        line = json.dumps({str(p): a_p for p, a_p in traces.items()}) + "\n"
+        if curve_path.exists() and curve_path.stat().st_size > 0:
+            with open(curve_path, "rb") as f:
+                f.seek(-1, 2)
+                if f.read() != b"\n":  # The last append was interrupted
+                    line = "\n" + line
+        with open(curve_path, "a") as f:
+            f.write(line)
+
+    def get_all_curves(self) -> list[Curve]:
+        stems = self.path.glob("*.jsonl")
+        return [tuple(int(s) for s in c.stem.split("_")) for c in stems]
+
+    def get_curve_path(self, curve: Curve) -> Path:
+        return self.path / ("_".join(map(str, curve)) + ".jsonl")
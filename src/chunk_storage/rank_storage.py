@@ -1,10 +1,19 @@
+import itertools
+import json
+import multiprocessing
 from pathlib import Path
-from typing import Any
+from typing import Any, MutableMapping
 
 from sympy import isprime
 
 from src.elliptic_curves.elliptic_curve import EllipticCurve, SingularCurveError
-from src.elliptic_curves.rank_calculator import calculate_rank
+from src.elliptic_curves.rank_calculator import (
+    SEARCH_HEIGHT,
+    calculate_rank,
+    normalized_coefficients,
+    set_image_of_alpha_cache,
+    set_searched_heights,
+)
 
 from ..chunk_storage import ChunkStorage
 
@@ -16,12 +25,157 @@ class RankStorage(ChunkStorage):
             chunk_range=[20, 20],
             ignore_values=["0"],
         )
+        self.image_cache_path = Path("./data/image_of_alpha.json")
+        self.image_cache: MutableMapping | None = None
+        # Budget of the search of points on each quartic: the greatest
+        # height and the seconds spent, None for no limit
+        self.search_height = SEARCH_HEIGHT
+        self.candidate_timeout: float | None = None
+        self.searched_heights_path = Path("./data/searched_heights.json")
+        self.searched_heights: MutableMapping | None = None
+        # Whether to save the timings of each stage of the 2-descent
+        self.store_timings = False
+        self.timings_path = Path("./data/rank_timings")
+        self.timings: MutableMapping | None = None
+
+    def _factorization_bound(self, ranges: list[range]) -> int:
+        """Bounds b and a² - 4b, whose divisors are used by the 2-descent"""
+        a, b = [max(abs(r[0]), abs(r[-1])) for r in ranges]
+        return a**2 + 4 * b
+
+    def _canonical_form(self, variables: tuple[int, ...]) -> tuple[int, ...]:
+        """Scaling (a, b) to (u²a, u⁴b) gives an isomorphic curve"""
+        a, b, _ = normalized_coefficients(variables[0], variables[1])
+        return a, b
+
+    def _initialize_worker(self, sieve_limit: int) -> None:
+        """
+        Workers share the images of alpha found during the chunk, and
+        the heights searched on the quartics whose points were not found
+        """
+        super()._initialize_worker(sieve_limit)
+        if self.image_cache is not None:
+            set_image_of_alpha_cache(self.image_cache)
+        if self.searched_heights is not None:
+            set_searched_heights(self.searched_heights)
+
+    def _is_final(self, result: Any) -> bool:
+        """
+        Ranks which are not exact can be refined with a bigger budget.
+        Exact ranks are final, since the candidates are only excluded by
+        the local conditions, never by a search cut short by the budget.
+        """
+        return "_" not in result
+
+    def calculate_chunk(
+        self, target_chunk: list[int] | None = None, n_processes: int = 1
+    ) -> None:
+        """
+        Calculates a new chunk, sharing the images of alpha and the
+        searched heights saved by the previous chunks between the
+        workers, and saves the new ones. If store_timings is set, the
+        timings of the curves calculated for the chunk are saved as well,
+        under every cell of their class, replacing only the timings of
+        those curves. A saved chunk is calculated again only where the
+        rank is not exact.
+        """
+        target_chunk = target_chunk or self._get_next_chunk()
+        with multiprocessing.Manager() as manager:
+            self.image_cache = manager.dict(self.get_image_cache())
+            self.searched_heights = manager.dict(self.get_searched_heights())
+            if self.store_timings:
+                self.timings = manager.dict()
+            try:
+                super().calculate_chunk(target_chunk, n_processes)
+                self.save_image_cache(dict(self.image_cache))
+                self.save_searched_heights(dict(self.searched_heights))
+                if self.timings is not None:
+                    timings = self.get_timings(target_chunk)
+                    timings.update(self._member_timings(target_chunk, self.timings))
+                    self.save_timings(target_chunk, timings)
+            finally:
+                self.image_cache = None
+                self.searched_heights = None
+                self.timings = None
+
+    def _member_timings(
+        self, target_chunk: list[int], timings: MutableMapping
+    ) -> dict[str, dict[str, float]]:
+        """
+        Copies the timings, which are recorded under the representative
+        of each class, to every cell of the chunk in that class
+        """
+        ranges = [
+            range(n * r, (n + 1) * r) for n, r in zip(target_chunk, self.chunk_range)
+        ]
+        member_timings: dict[str, dict[str, float]] = {}
+        for a, b in itertools.product(*ranges):
+            key = "_".join(map(str, self._canonical_form((a, b))))
+            if key in timings:
+                member_timings[f"{a}_{b}"] = timings[key]
+        return member_timings
+
+    def refine(self, n_processes: int = 1) -> None:
+        """
+        Calculates again the saved chunks where some rank is not exact,
+        e.g. after raising search_height or candidate_timeout. Only those
+        cells are calculated, and their searches resume where they stopped.
+        """
+        for chunk in self.get_all_chunks():
+            if not all(self._is_final(result) for result in self.get_chunk_data(chunk)):
+                self.calculate_chunk(chunk, n_processes)
+
+    def get_image_cache(self) -> dict[str, tuple[list, int, list[int], bool]]:
+        if not self.image_cache_path.exists():
+            return {}
+        with open(self.image_cache_path, "r") as f:
+            return json.load(f)
+
+    def save_image_cache(
+        self, image_cache: dict[str, tuple[list, int, list[int], bool]]
+    ) -> None:
+        with open(self.image_cache_path, "w") as f:
+            json.dump(image_cache, f)
+
+    def get_searched_heights(self) -> dict[str, int]:
+        if not self.searched_heights_path.exists():
+            return {}
+        with open(self.searched_heights_path, "r") as f:
+            return json.load(f)
+
+    def save_searched_heights(self, searched_heights: dict[str, int]) -> None:
+        with open(self.searched_heights_path, "w") as f:
+            json.dump(searched_heights, f)
+
+    def get_timings(self, target_chunk: list[int]) -> dict[str, dict[str, float]]:
+        """Returns the timings of each stage, keyed by a_b, of the chunk"""
+        timings_path = self.get_timings_path(target_chunk)
+        if not timings_path.exists():
+            return {}
+        with open(timings_path, "r") as f:
+            return json.load(f)
+
+    def save_timings(
+        self, target_chunk: list[int], timings: dict[str, dict[str, float]]
+    ) -> None:
+        if not self.timings_path.is_dir():
+            self.timings_path.mkdir()
+        with open(self.get_timings_path(target_chunk), "w") as f:
+            json.dump(timings, f)
+
+    def get_timings_path(self, target_chunk: list[int]) -> Path:
+        return self.timings_path / ("_".join(map(str, target_chunk)) + ".json")
 
     def _calculate(self, variables: list[int]) -> Any:
         a, b = variables[0], variables[1]
         try:
             e = EllipticCurve(a, b, 0)
-            lower, upper = calculate_rank(e)
+            result = calculate_rank(
+                e, timeout=self.candidate_timeout, max_height=self.search_height
+            )
+            if self.timings is not None:
+                self.timings[f"{a}_{b}"] = result.timings
+            lower, upper = result.lower, result.upper
             return str(lower) if lower == upper else f"{lower}_{upper}"
         except SingularCurveError:
             return "-"
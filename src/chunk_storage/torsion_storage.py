@@ -4,21 +4,34 @@ from typing import Any
 from sympy import isprime
 
 from src.elliptic_curves.elliptic_curve import EllipticCurve, SingularCurveError
+from src.elliptic_curves.isomorphism import canonical_form
 
 from ..chunk_storage import ChunkStorage
 
 
 class TorsionStorage(ChunkStorage):
-    def __init__(self):
+    def __init__(self, torsion_strategy: str | None = None):
         super().__init__(
             path=Path("./data/torsion"),
             chunk_range=[100, 100, 100],
             ignore_values=["0"],
         )
+        self.torsion_strategy = torsion_strategy
+
+    def _factorization_bound(self, ranges: list[range]) -> int:
+        """Bounds the discriminant -4a³c + a²b² + 18abc -4b³ -27c² on the chunk"""
+        a, b, c = [max(abs(r[0]), abs(r[-1])) for r in ranges]
+        return 4 * a**3 * c + a**2 * b**2 + 18 * a * b * c + 4 * b**3 + 27 * c**2
+
+    def _canonical_form(self, variables: tuple[int, ...]) -> tuple[int, ...]:
+        """Isomorphic curves have the same torsion subgroup"""
+        return canonical_form(variables[0], variables[1], variables[2])
 
     def _calculate(self, variables: list[int]) -> Any:
         a, b, c = variables[0], variables[1], variables[2]
         try:
-            return EllipticCurve(a, b, c).torsion_name
+            return EllipticCurve(
+                a, b, c, torsion_strategy=self.torsion_strategy
+            ).torsion_name
         except SingularCurveError:
             return "-"
@@ -1,3 +1,9 @@
-from .elliptic_curve import EllipticCurve, SingularCurveError
+from .arithmetic import get_backend, set_default_backend
+from .elliptic_curve import (
+    EllipticCurve,
+    SingularCurveError,
+    set_point_validation,
+    set_torsion_strategy,
+)
 from .point import O, Point
-from .rank_calculator import calculate_rank
+from .rank_calculator import RankResult, calculate_rank
@@ -0,0 +1,89 @@
+"""
+This module implements the arithmetic backends used to store the coordinates
+of rational points. The default backend keeps every coordinate as a
+fractions.Fraction, i.e. a pair of plain Python integers, which is much faster
+than sympy for the slopes, squares and subtractions of the group law. The sympy
+backend is kept as an optional interoperability layer and sympy is only
+imported when it is actually selected.
+"""
+
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from typing import Any
+
+
+class ArithmeticBackend(ABC):
+    name: str
+
+    @abstractmethod
+    def convert(self, value: Any) -> Any:
+        """Converts an int, Fraction or sympy Rational to the backend type"""
+
+    @abstractmethod
+    def is_integer(self, value: Any) -> bool:
+        """Checks if a number of the backend type is an integer"""
+
+    def numerator_and_denominator(self, value: Any) -> tuple[int, int]:
+        """Returns the pair (numerator, denominator) of a rational number"""
+        fraction = FractionBackend.convert_to_fraction(value)
+        return fraction.numerator, fraction.denominator
+
+
+class FractionBackend(ArithmeticBackend):
+    name = "fraction"
+
+    @staticmethod
+    def convert_to_fraction(value: Any) -> Fraction:
+        if isinstance(value, Fraction):
+            return value
+        if isinstance(value, int):
+            return Fraction(value)
+        if hasattr(value, "p") and hasattr(value, "q"):  # sympy Rational
+            return Fraction(int(value.p), int(value.q))
+        return Fraction(value)
+
+    def convert(self, value: Any) -> Fraction:
+        return self.convert_to_fraction(value)
+
+    def is_integer(self, value: Fraction) -> bool:
+        return value.denominator == 1
+
+
+class SympyBackend(ArithmeticBackend):
+    name = "sympy"
+
+    def convert(self, value: Any) -> Any:
+        from sympy import Rational
+
+        if isinstance(value, Fraction):
+            return Rational(value.numerator, value.denominator)
+        return Rational(value)
+
+    def is_integer(self, value: Any) -> bool:
+        return bool(value.is_Integer)
+
+
+BACKENDS: dict[str, ArithmeticBackend] = {
+    backend.name: backend for backend in [FractionBackend(), SympyBackend()]
+}
+_default_backend: ArithmeticBackend = BACKENDS["fraction"]
+
+
+def get_backend(backend: str | ArithmeticBackend | None = None) -> ArithmeticBackend:
+    """
+    Returns the backend with the given name. If no
+    name is given, returns the default backend.
+    """
+    if backend is None:
+        return _default_backend
+    if isinstance(backend, ArithmeticBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown arithmetic backend '{backend}'.")
+    return BACKENDS[backend]
+
+
+def set_default_backend(backend: str | ArithmeticBackend) -> None:
+    """Sets the backend used by points created without an explicit one"""
+    global _default_backend
+    _default_backend = get_backend(backend)
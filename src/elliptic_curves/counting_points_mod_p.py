@@ -1,8 +1,15 @@
-from typing import Literal
+from functools import lru_cache
+from math import isqrt, lcm
+from typing import Iterable, Iterator, Literal
 
+import numpy as np
 from sympy import Rational as R
-from sympy import fraction, primerange
+from sympy import primerange
 
+from ..utils.gaussian_integers import factor_primary_rational_prime
+from ..utils.polynomials import poly_gcd, poly_pow_mod, poly_sub
+from ..utils.quartic_symbol import quartic_symbol_mod_prime
+from ..utils.rational_integers import factorization_of
 from .elliptic_curve import EllipticCurve
 
 
@@ -13,16 +20,14 @@ class RecursiveNumbers:
     def find(self, index: int) -> R:
         if index % 2 != 0:  # Odd index is always zero
             return R(0, 1)
-        if index in self.found_numbers:
-            return self.found_numbers[index]
-        sum = R(0, 1)
-        # print(f"index = {index}")
-        for i in range(4, index - 4 + 1, 2):
-            # print((i, index - i))
-            sum += self.find(i) * self.find(index - i)
-        curr_number = 12 * sum / ((index + 5) * (index - 2))
-        self.found_numbers[index] = curr_number
-        return curr_number
+        # Fill in the missing indices in increasing order, so that
+        # the recursion depth does not grow with the index
+        for i in range(max(self.found_numbers) + 2, index + 1, 2):
+            sum = R(0, 1)
+            for j in range(4, i - 4 + 1, 2):
+                sum += self.found_numbers[j] * self.found_numbers[i - j]
+            self.found_numbers[i] = 12 * sum / ((i + 5) * (i - 2))
+        return self.found_numbers[index]
 
 
 class FNumbers(RecursiveNumbers):
@@ -35,20 +40,60 @@ class ModifiedBernoulliNumbers(RecursiveNumbers):
         super().__init__(index_4=R(1, 240 * 2), index_6=-R(1, 504 * 24))
 
 
+def recursive_numbers_mod_p(
+    index_4: int, index_6: int, p: int, length: int
+) -> np.ndarray:
+    """
+    Returns the residues mod p of the RecursiveNumbers with the given
+    4th and 6th terms, as an array whose k-th entry is the term of index
+    2k. Each term is a single dot product of the previous ones, so the
+    terms below the index p - 5, the first with p in its denominator,
+    are found iteratively in linear memory.
+    """
+    terms = np.zeros(max(length, 4), dtype=np.int64)
+    terms[2], terms[3] = index_4 % p, index_6 % p
+    for k in range(4, length):
+        sum = int(np.dot(terms[2 : k - 1], terms[k - 2 : 1 : -1])) % p
+        terms[k] = 12 * sum * pow((2 * k + 5) * (2 * k - 2), -1, p) % p
+    return terms[:length]
+
+
+def pole_residue_mod_p(index_4: int, index_6: int, p: int) -> int:
+    """
+    The terms of index p - 5 and p - 1 have a simple pole at p, and the
+    residue of the latter is -2 times the 4th term times the residue of
+    the former. Returns these residues mod p up to a constant factor
+    depending only on p, which cancels in the ratio of two sequences.
+    """
+    k = (p - 5) // 2
+    terms = recursive_numbers_mod_p(index_4, index_6, p, k)
+    return int(terms[2]) * int(np.dot(terms[2 : k - 1], terms[k - 2 : 1 : -1])) % p
+
+
+@lru_cache(maxsize=None)
+def modified_bernoulli_residue_mod_p(p: int) -> int:
+    """Returns the pole_residue_mod_p of the ModifiedBernoulliNumbers"""
+    return pole_residue_mod_p(pow(480, -1, p), -pow(504 * 24, -1, p), p)
+
+
 def count_points_mod_p(t2: int, t3: int, max_prime: int) -> dict[int, int]:
     """
     Returns a dictionary where the key is a prime and
     the value is the number of points in the elliptic curve
                     E : y² = 4x³ -t2x -t3
     reduced modulo p. The function checks primes up to n_primes.
+    The numbers of index p - 1 are compared through their residues
+    at p, which are computed mod p, instead of as exact rationals.
+    At the rare primes where the Bernoulli residue vanishes, such as
+    p = 1039, the exact ratio has p in its denominator, so the formula
+    gives no value mod p and those primes are left out.
     """
-    bn, fn = ModifiedBernoulliNumbers(), FNumbers(t2, t3)
     count: dict[int, int] = {}
     for p in primerange(19, max_prime):
-        num, den = fraction(fn.find(p - 1) / bn.find(p - 1))
-        # print((num, den))
-        num, den = num % p, den % p
-        # print((num, den))
+        den = modified_bernoulli_residue_mod_p(p)
+        if den == 0:
+            continue
+        num = pole_residue_mod_p(t2 * pow(40, -1, p), t3 * pow(56, -1, p), p)
         a_p = (num * pow(den, -1, p)) % p
         if a_p > (p - 1) // 2:
             a_p -= p
@@ -84,3 +129,362 @@ def count_points_mod_p_naive_weierstrass_form(
             ) % p == 0:
                 solutions.add((x, y))
     return solutions
+
+
+# Below this prime, counting in pure Python beats the NumPy overhead
+NUMPY_THRESHOLD = 100
+
+
+@lru_cache(maxsize=256)
+def square_roots_count_mod(p: int) -> list[int]:
+    """
+    Returns a table whose r-th entry is the number
+    of solutions mod p to the equation y² = r.
+    """
+    table = [0] * p
+    for y in range(p):
+        table[y * y % p] += 1
+    return table
+
+
+@lru_cache(maxsize=32)
+def square_root_tables_mod(p: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns two arrays indexed by the residues r mod p. The first one
+    holds the number of solutions to y² = r, and the second one the
+    smallest such y, or -1 if r is not a square mod p.
+    """
+    ys = np.arange(p // 2 + 1, dtype=np.int64)
+    residues = ys * ys % p
+    counts = np.zeros(p, dtype=np.int64)
+    np.add.at(counts, residues, 1)
+    np.add.at(counts, residues[(ys != 0) & (2 * ys != p)], 1)
+    roots = np.full(p, -1, dtype=np.int64)
+    roots[residues] = ys
+    return counts, roots
+
+
+def evaluate_cubic_mod_p(coefficients: tuple[int, int, int, int], p: int) -> np.ndarray:
+    """
+    Returns the values mod p of c₃x³ + c₂x² + c₁x + c₀ for every
+    x in range(p), given the coefficients (c₃, c₂, c₁, c₀).
+    """
+    x = np.arange(p, dtype=np.int64)
+    values = np.full(p, coefficients[0] % p, dtype=np.int64)
+    for coefficient in coefficients[1:]:
+        values = (values * x + coefficient % p) % p
+    return values
+
+
+def count_solutions_mod_p(coefficients: tuple[int, int, int, int], p: int) -> int:
+    """
+    Returns the number of solutions (x, y) mod p to the equation
+    y² = c₃x³ + c₂x² + c₁x + c₀, given the coefficients (c₃, c₂, c₁, c₀).
+    The cubic is evaluated once for each x and the number of square
+    roots is read from a table, so the cost is O(p) and no solution
+    is ever stored.
+    """
+    if p < NUMPY_THRESHOLD:
+        roots = square_roots_count_mod(p)
+        c3, c2, c1, c0 = [k % p for k in coefficients]
+        return sum(roots[(((c3 * x + c2) * x + c1) * x + c0) % p] for x in range(p))
+    counts, _ = square_root_tables_mod(p)
+    return int(counts[evaluate_cubic_mod_p(coefficients, p)].sum())
+
+
+def iterate_solutions_mod_p(
+    coefficients: tuple[int, int, int, int], p: int
+) -> Iterator[tuple[int, int]]:
+    """
+    Lazily yields every solution (x, y) mod p to the equation
+    y² = c₃x³ + c₂x² + c₁x + c₀, given the coefficients (c₃, c₂, c₁, c₀).
+    """
+    _, roots = square_root_tables_mod(p)
+    values = evaluate_cubic_mod_p(coefficients, p)
+    for x in np.flatnonzero(roots[values] >= 0).tolist():
+        y = int(roots[values[x]])
+        yield (x, y)
+        if y != 0 and 2 * y != p:
+            yield (x, p - y)
+
+
+def number_of_points_mod_p(a: int, b: int, c: int, p: int) -> int:
+    """
+    Returns the number of points of E : y² = x³ + ax² + bx + c
+    reduced mod p, including the point at infinity.
+    """
+    if p > BSGS_THRESHOLD:
+        return number_of_points_mod_p_bsgs(a, b, c, p)
+    return 1 + count_solutions_mod_p((1, a, b, c), p)
+
+
+def points_mod_p(
+    a: int, b: int, c: int, p: int
+) -> Iterator[tuple[int, int] | Literal["O"]]:
+    """
+    Lazily yields all points of E : y² = x³ + ax² + bx + c
+    reduced mod p, starting with the point at infinity.
+    """
+    yield "O"
+    yield from iterate_solutions_mod_p((1, a, b, c), p)
+
+
+def number_of_solutions_mod_p(t2: int, t3: int, p: int) -> int:
+    """Returns the number of solutions mod p to y² = 4x³ -t2x -t3"""
+    return count_solutions_mod_p((4, 0, -t2, -t3), p)
+
+
+def discriminants_mod_p(coefficients: np.ndarray, p: int) -> np.ndarray:
+    """
+    Returns -4a³c + a²b² + 18abc -4b³ -27c² mod p for every row
+    (a, b, c) of the array, reducing after every product.
+    """
+    a, b, c = [coefficients[:, i] % p for i in range(3)]
+    a2, b2, c2, ab = a * a % p, b * b % p, c * c % p, a * b % p
+    return (
+        -4 * (a2 * a % p) * c % p
+        + a2 * b2 % p
+        + 18 * (ab * c % p) % p
+        - 4 * (b2 * b % p)
+        - 27 * c2
+    ) % p
+
+
+def frobenius_traces(
+    coefficients: list[tuple[int, int, int]] | np.ndarray,
+    primes: Iterable[int],
+    max_block_size: int = 2**22,
+) -> tuple[list[int], np.ndarray, np.ndarray]:
+    """
+    Computes a_p = p + 1 - #E(F_p) for many curves E : y² = x³ + ax² + bx + c
+    and many primes at once. Returns (primes, traces, bad), where traces
+    and bad are arrays of shape (number of curves, number of primes), and
+    bad[i, j] is True if p_j divides 2Δ, i.e. the curve has bad reduction.
+    The traces at bad primes are still p + 1 minus the number of points
+    of the singular reduction. For each prime, the square root table is
+    built once, curves are grouped by their reduction mod p, and the
+    cubic is evaluated for blocks of reductions together, with at most
+    max_block_size values at a time.
+    """
+    coefficients = np.asarray(coefficients, dtype=np.int64).reshape(-1, 3)
+    primes = list(primes)
+    n_curves = len(coefficients)
+    traces = np.zeros((n_curves, len(primes)), dtype=np.int64)
+    bad = np.zeros((n_curves, len(primes)), dtype=bool)
+    for j, p in enumerate(primes):
+        counts, _ = square_root_tables_mod(p)
+        x = np.arange(p, dtype=np.int64)
+        # Curves with the same reduction mod p are only counted once
+        reductions, inverse = np.unique(coefficients % p, axis=0, return_inverse=True)
+        n_points = np.zeros(len(reductions), dtype=np.int64)
+        block_size = max(1, max_block_size // p)
+        for start in range(0, len(reductions), block_size):
+            block = reductions[start : start + block_size]
+            values = np.ones((len(block), p), dtype=np.int64)
+            for i in range(3):
+                values = (values * x + block[:, i : i + 1]) % p
+            n_points[start : start + block_size] = 1 + counts[values].sum(axis=1)
+        traces[:, j] = p + 1 - n_points[inverse.reshape(-1)]
+        bad[:, j] = (p == 2) | (discriminants_mod_p(reductions, p) == 0)[
+            inverse.reshape(-1)
+        ]
+    return primes, traces, bad
+
+
+# Above this prime, the baby-step giant-step count beats the linear ones
+BSGS_THRESHOLD = 2**14
+# Below this prime, Mestre's theorem does not guarantee that the search ends
+MESTRE_MIN_PRIME = 229
+
+AffinePoint = tuple[int, int] | None  # None is the point at infinity
+
+
+def legendre_symbol(r: int, p: int) -> int:
+    """Returns 1 if r is a non-zero square mod the odd prime p, -1 if not, or 0"""
+    symbol = pow(r, (p - 1) // 2, p)
+    return -1 if symbol == p - 1 else symbol
+
+
+def square_root_mod_p(r: int, p: int) -> int:
+    """Returns y with y² = r mod the odd prime p, given that r is a square"""
+    r %= p
+    if r == 0:
+        return 0
+    if p % 4 == 3:
+        return pow(r, (p + 1) // 4, p)
+    # Tonelli-Shanks, with p - 1 = q 2^s
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q, s = q // 2, s + 1
+    z = next(z for z in range(2, p) if legendre_symbol(z, p) == -1)
+    m, c, t, y = s, pow(z, q, p), pow(r, q, p), pow(r, (q + 1) // 2, p)
+    while t != 1:
+        i, t2i = 0, t
+        while t2i != 1:
+            i, t2i = i + 1, t2i * t2i % p
+        factor = pow(c, 1 << (m - i - 1), p)
+        m, c = i, factor * factor % p
+        t, y = t * c % p, y * factor % p
+    return y
+
+
+def add_mod_p(
+    p_1: AffinePoint, p_2: AffinePoint, a: int, b: int, p: int
+) -> AffinePoint:
+    """Adds two points of E : y² = x³ + ax² + bx + c reduced mod p"""
+    if p_1 is None:
+        return p_2
+    if p_2 is None:
+        return p_1
+    (x1, y1), (x2, y2) = p_1, p_2
+    if x1 == x2:
+        if (y1 + y2) % p == 0:
+            return None
+        slope = (3 * x1 * x1 + 2 * a * x1 + b) * pow(2 * y1, -1, p) % p
+    else:
+        slope = (y2 - y1) * pow(x2 - x1, -1, p) % p
+    x3 = (slope * slope - a - x1 - x2) % p
+    return x3, (slope * (x1 - x3) - y1) % p
+
+
+def multiply_mod_p(point: AffinePoint, n: int, a: int, b: int, p: int) -> AffinePoint:
+    """Computes n times the point with the double-and-add method"""
+    if n < 0:
+        point, n = negate_mod_p(point, p), -n
+    result = None
+    while n > 0:
+        if n & 1:
+            result = add_mod_p(result, point, a, b, p)
+        point = add_mod_p(point, point, a, b, p)
+        n >>= 1
+    return result
+
+
+def negate_mod_p(point: AffinePoint, p: int) -> AffinePoint:
+    return None if point is None else (point[0], -point[1] % p)
+
+
+def hasse_interval(p: int) -> tuple[int, int]:
+    """Returns the bounds of p + 1 - 2√p <= #E(F_p) <= p + 1 + 2√p"""
+    width = isqrt(4 * p)
+    return p + 1 - width, p + 1 + width
+
+
+def annihilating_multiple(point: AffinePoint, a: int, b: int, p: int) -> int:
+    """
+    Returns some N in the Hasse interval with NP = O, writing N = lo + k
+    and matching the baby steps jP with the giant steps -(lo + im)P by
+    their x coordinate, so that k = im ± j.
+    """
+    lo, hi = hasse_interval(p)
+    m = isqrt(hi - lo) + 1
+    baby_steps: dict[int, int] = {}
+    step = None
+    for j in range(1, m + 1):
+        step = add_mod_p(step, point, a, b, p)
+        if step is None:  # The order of the point is j
+            return lo + (-lo) % j
+        baby_steps.setdefault(step[0], j)
+    giant_step = negate_mod_p(multiply_mod_p(point, m, a, b, p), p)
+    target = negate_mod_p(multiply_mod_p(point, lo, a, b, p), p)
+    for i in range(m + 2):
+        if target is None:
+            return lo + i * m
+        j = baby_steps.get(target[0])
+        if j is not None:
+            if multiply_mod_p(point, j, a, b, p) == target:
+                return lo + i * m + j
+            return lo + i * m - j
+        target = add_mod_p(target, giant_step, a, b, p)
+    raise ArithmeticError(f"No multiple of the point is in the Hasse interval mod {p}.")
+
+
+def order_mod_p(point: AffinePoint, a: int, b: int, p: int) -> int:
+    """Returns the order of a point, given by dividing out an annihilating N"""
+    order = annihilating_multiple(point, a, b, p)
+    for q, _ in factorization_of(order):
+        while order % q == 0 and multiply_mod_p(point, order // q, a, b, p) is None:
+            order //= q
+    return order
+
+
+def singular_number_of_points_mod_p(a: int, b: int, c: int, p: int) -> int:
+    """
+    Returns #E(F_p) for an odd prime p dividing the discriminant. The cubic
+    is (x - r)²(x - s) mod p, and substituting y = (x - r)t shows that
+    there are p + 1 - ((r - s)/p) points, counting the point at infinity,
+    where ((r - s)/p) is the Legendre symbol.
+    """
+    if (a * a - 3 * b) % p == 0:  # Triple root, a cusp
+        return p + 1
+    r = (9 * c - a * b) * pow(2 * (a * a - 3 * b), -1, p) % p
+    s = (-a - 2 * r) % p
+    return p + 1 - legendre_symbol(r - s, p)
+
+
+def number_of_points_mod_p_bsgs(a: int, b: int, c: int, p: int) -> int:
+    """
+    Returns #E(F_p) for E : y² = x³ + ax² + bx + c in O(p^(1/4)) group
+    operations, using Mestre's method. Points P of E and P' of its
+    quadratic twist E' are taken in turn, and their orders are found
+    with a baby-step giant-step search of the Hasse interval. Since
+    #E + #E' = 2p + 2, the count is known once a single N in the interval
+    is divisible by the orders on E while 2p + 2 - N is divisible by the
+    orders on E'. For p > 229 this always happens eventually.
+    """
+    if p <= MESTRE_MIN_PRIME:
+        return number_of_points_mod_p(a, b, c, p)
+    if (-4 * a**3 * c + a**2 * b**2 + 18 * a * b * c - 4 * b**3 - 27 * c**2) % p == 0:
+        return singular_number_of_points_mod_p(a, b, c, p)
+    d = next(d for d in range(2, p) if legendre_symbol(d, p) == -1)
+    # y² = x³ + dax² + d²bx + d³c is isomorphic to the twist dy² = f(x)
+    curves = [(a % p, b % p, c % p), (d * a % p, d * d * b % p, pow(d, 3, p) * c % p)]
+    orders = [1, 1]
+    lo, hi = hasse_interval(p)
+    x = 0
+    while True:
+        for twist, (a_t, b_t, c_t) in enumerate(curves):
+            while True:
+                value = (((x + a_t) * x + b_t) * x + c_t) % p
+                x += 1
+                if legendre_symbol(value, p) == 1:
+                    break
+            point = (x - 1, square_root_mod_p(value, p))
+            orders[twist] = lcm(orders[twist], order_mod_p(point, a_t, b_t, p))
+            candidates = [
+                n
+                for n in range(lo + (-lo) % orders[0], hi + 1, orders[0])
+                if (2 * p + 2 - n) % orders[1] == 0
+            ]
+            if len(candidates) == 1:
+                return candidates[0]
+
+
+def cm_frobenius_trace(D: int, p: int) -> int:
+    """
+    Returns a_p = p + 1 - #E(F_p) for E : y² = x³ - Dx, without counting.
+    For p = 4k+3 not dividing 2D the reduction is supersingular and
+    a_p = 0. For p = 4k+1, write p = ππ̄ with π primary and let χ be the
+    quartic symbol [D / π], then a_p = χ̄π + χπ̄ (Ireland-Rosen, 18.5).
+    """
+    if p == 2 or D % p == 0:
+        return p + 1 - number_of_points_mod_p(0, -D, 0, p)
+    if p % 4 == 3:
+        return 0
+    pi, _ = factor_primary_rational_prime(p)
+    chi = quartic_symbol_mod_prime(D, pi)
+    return round(2 * (chi.conjugate() * pi).real)
+
+
+def has_two_torsion_mod_p(a: int, b: int, c: int, p: int) -> bool:
+    """
+    Returns True if E : y² = x³ + ax² + bx + c has a point of order 2 mod
+    the prime p, i.e. if the cubic has a root mod p. For odd primes of
+    good reduction this means that #E(F_p) is even, and so is
+    a_p = p + 1 - #E(F_p). The roots of
+    the cubic in F_p are those of its gcd with x^p - x, where x^p is
+    computed mod the cubic in O(log p) multiplications.
+    """
+    cubic = [c, b, a, 1]
+    x_to_the_p = poly_pow_mod([0, 1], p, cubic, p)
+    return len(poly_gcd(cubic, poly_sub(x_to_the_p, [0, 1]), p)) > 1
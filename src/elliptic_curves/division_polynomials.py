@@ -0,0 +1,102 @@
+"""
+This module implements the division polynomials of the elliptic curve
+E : y² = x³ + ax² + bx + c. A point P = (x, y) different from O satisfies
+nP = O if and only if ψ_n(P) = 0. For odd n, ψ_n is a polynomial in x,
+and for even n it is ψ_2 = 2y times a polynomial in x, so we work with
+
+    f_n = ψ_n for n odd,    f_n = ψ_n / ψ_2 for n even,
+
+which are integer polynomials in x. With F = ψ_2² = 4(x³ + ax² + bx + c),
+they satisfy the recurrences
+
+    f_2m+1 = F² f_m+2 f_m³ - f_m-1 f_m+1³    (m even),
+    f_2m+1 = f_m+2 f_m³ - F² f_m-1 f_m+1³    (m odd),
+    f_2m = f_m (f_m+2 f_m-1² - f_m-2 f_m+1²).
+"""
+
+from ..utils.polynomials import integer_roots_in_interval, poly_mul, poly_sub
+from ..utils.rational_integers import integer_cube_root
+
+
+class DivisionPolynomials:
+    def __init__(self, a: int, b: int, c: int):
+        b2, b4, b6, b8 = 4 * a, 2 * b, 4 * c, 4 * a * c - b**2
+        self.F = [4 * c, 4 * b, 4 * a, 4]
+        self.found_polynomials: dict[int, list[int]] = {
+            0: [],
+            1: [1],
+            2: [1],
+            3: [b8, 3 * b6, 3 * b4, b2, 3],
+            4: [
+                b4 * b8 - b6**2,
+                b2 * b8 - b4 * b6,
+                10 * b8,
+                10 * b6,
+                5 * b4,
+                b2,
+                2,
+            ],
+        }
+
+    def find(self, n: int) -> list[int]:
+        """Returns f_n, in increasing order of degree"""
+        if n in self.found_polynomials:
+            return self.found_polynomials[n]
+        m = n // 2
+        if n % 2 == 1:
+            first = poly_mul(self.find(m + 2), _cube(self.find(m)))
+            second = poly_mul(self.find(m - 1), _cube(self.find(m + 1)))
+            F2 = poly_mul(self.F, self.F)
+            if m % 2 == 0:
+                first = poly_mul(F2, first)
+            else:
+                second = poly_mul(F2, second)
+            polynomial = poly_sub(first, second)
+        else:
+            polynomial = poly_mul(
+                self.find(m),
+                poly_sub(
+                    poly_mul(self.find(m + 2), _square(self.find(m - 1))),
+                    poly_mul(self.find(m - 2), _square(self.find(m + 1))),
+                ),
+            )
+        self.found_polynomials[n] = polynomial
+        return polynomial
+
+
+def _square(p: list[int]) -> list[int]:
+    return poly_mul(p, p)
+
+
+def _cube(p: list[int]) -> list[int]:
+    return poly_mul(p, _square(p))
+
+
+def torsion_x_bound(a: int, b: int, c: int, discriminant: int) -> int:
+    """
+    Returns M such that every torsion point (x, y) has |x| <= M. By
+    Nagell-Lutz, y² = x³ + ax² + bx + c divides the discriminant or is
+    zero, and |x³ + ax² + bx + c| > |discriminant| for |x| >= M.
+    """
+    cube_root = integer_cube_root(abs(discriminant)) + 1
+    return abs(a) + abs(b) + abs(c) + cube_root + 1
+
+
+def torsion_x_coordinates(
+    a: int, b: int, c: int, discriminant: int, orders: list[int]
+) -> set[int]:
+    """
+    Returns all integers x which are roots of f_n for some n in orders,
+    together with the roots of x³ + ax² + bx + c if some n is even. By
+    Nagell-Lutz, these contain the x coordinates of every torsion point
+    whose order divides one of the given orders.
+    """
+    bound = torsion_x_bound(a, b, c, discriminant)
+    polynomials = DivisionPolynomials(a, b, c)
+    xs: set[int] = set()
+    if any(n % 2 == 0 for n in orders):
+        xs |= integer_roots_in_interval([c, b, a, 1], bound)
+    for n in orders:
+        if n > 2:
+            xs |= integer_roots_in_interval(polynomials.find(n), bound)
+    return xs
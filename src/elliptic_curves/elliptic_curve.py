@@ -5,9 +5,10 @@ Amongst other things, it implements the group operation and a calculation
 of the torsion subgroup based on Nagell-Lutz and Mazur's theorems.
 """
 
-from sympy import Rational as R
-from sympy import symbols
+from math import gcd, isqrt, lcm
 
+from .arithmetic import ArithmeticBackend, get_backend
+from .jacobian import from_jacobian, jacobian_multiply, to_jacobian
 from .point import O, Point
 
 
@@ -15,13 +16,67 @@ class SingularCurveError(Exception):
     pass
 
 
+_validate_points = True
+
+# Possible sizes of the torsion subgroup, by Mazur's theorem
+MAZUR_TORSION_SIZES = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 16]
+
+# Possible orders of a torsion point, by Mazur's theorem
+MAZUR_POINT_ORDERS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12]
+
+# Small odd primes used to bound the torsion subgroup by reduction
+TORSION_BOUND_PRIMES = [3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+
+
+TORSION_STRATEGIES = ["nagell-lutz", "division-polynomials"]
+_torsion_strategy = "nagell-lutz"
+
+
+def set_torsion_strategy(strategy: str) -> None:
+    """
+    Sets the algorithm used to compute the torsion subgroup, for every
+    curve that does not set its own strategy. See TORSION_STRATEGIES.
+    """
+    global _torsion_strategy
+    if strategy not in TORSION_STRATEGIES:
+        raise ValueError(f"Unknown torsion strategy '{strategy}'.")
+    _torsion_strategy = strategy
+
+
+def set_point_validation(enabled: bool) -> None:
+    """
+    Turns on or off the check that the operands of the public group
+    law methods lie on the curve, for every curve that does not set
+    its own validation mode.
+    """
+    global _validate_points
+    _validate_points = enabled
+
+
 class EllipticCurve:
-    def __init__(self, a: int, b: int, c: int):
+    def __init__(
+        self,
+        a: int,
+        b: int,
+        c: int,
+        backend: str | ArithmeticBackend | None = None,
+        validate: bool | None = None,
+        torsion_strategy: str | None = None,
+    ):
         """
         Creates an ellptic curve given by: y² = x³ + ax² + bx + c.
         The discriminant is -4a³c + a²b² + 18abc -4b³ -27c².
+        The backend determines how the coordinates of the points
+        are stored, see arithmetic.py. Defaults to fractions.
+        If validate is None, the global validation mode is used,
+        and likewise for the torsion strategy.
         """
+        if torsion_strategy not in TORSION_STRATEGIES + [None]:
+            raise ValueError(f"Unknown torsion strategy '{torsion_strategy}'.")
         self.a, self.b, self.c = a, b, c
+        self.backend = get_backend(backend)
+        self.validate = validate
+        self.torsion_strategy = torsion_strategy
         self.discriminant = (
             -4 * a**3 * c + a**2 * b**2 + 18 * a * b * c - 4 * b**3 - 27 * c**2
         )
@@ -30,6 +85,7 @@ class EllipticCurve:
         self._has_point_of_infinite_order: bool | None = None
         self._torsionpoint2order: dict[Point, int] | None = None
         self._torsion_name: str | None = None
+        self._torsion_bound: int | None = None
 
     def is_on_the_curve(self, p: Point) -> bool:
         """Checks if a given point lies inside the curve"""
@@ -42,36 +98,84 @@ class EllipticCurve:
         """Calculates the inverse of p"""
         if p.is_neutral_element():
             return O
-        return Point((p.x, -p.y))
+        return Point((p.x, -p.y), self.backend)
+
+    def is_validating(self) -> bool:
+        """Checks if the operands of the group law are validated"""
+        return _validate_points if self.validate is None else self.validate
 
     def add(self, p_1: Point, p_2: Point) -> Point:
         """Operates the points p_1 and p_2"""
-        assert self.is_on_the_curve(p_1)
-        assert self.is_on_the_curve(p_2)
+        if self.is_validating():
+            assert self.is_on_the_curve(p_1)
+            assert self.is_on_the_curve(p_2)
+        return self._add(p_1, p_2)
+
+    def _add(self, p_1: Point, p_2: Point) -> Point:
+        """
+        Operates the points p_1 and p_2 without checking that
+        they lie on the curve. Only for trusted inputs.
+        """
         if p_1.is_neutral_element():
             return p_2
         if p_2.is_neutral_element():
             return p_1
-        if p_1 == self.inv(p_2):
-            return O
         x1, y1, x2, y2 = p_1.x, p_1.y, p_2.x, p_2.y
-        a, b, c = self.a, self.b, self.c
-        slope = (
-            (y2 - y1) / (x2 - x1)
-            if p_1 != p_2
-            else (3 * x1**2 + 2 * a * x1 + b) / (2 * p_1.y)
-        )
+        a, b = self.a, self.b
+        if x1 == x2:
+            if y1 == -y2:
+                return O
+            slope = (3 * x1**2 + 2 * a * x1 + b) / (2 * y1)
+        else:
+            slope = (y2 - y1) / (x2 - x1)
         x3 = slope**2 - a - x1 - x2
         offset = y1 - slope * x1
         y3 = -(slope * x3 + offset)
-        return Point((x3, y3))
+        return Point((x3, y3), self.backend)
+
+    def multiply(self, p: Point, n: int) -> Point:
+        """
+        Calculates np, for any integer n. The multiples are computed
+        in Jacobian coordinates with the windowed NAF method, so only
+        O(log n) integer operations and a single conversion back to
+        affine coordinates are needed.
+        """
+        if self.is_validating():
+            assert self.is_on_the_curve(p)
+        multiple = jacobian_multiply(to_jacobian(p), n, self.a, self.b)
+        return from_jacobian(multiple, self.backend)
 
     def __str__(self):
+        from sympy import symbols
+
         x, y = symbols("x, y")
         exp = x**3 + self.a * x**2 + self.b * x + self.c
         exp_str = str(exp).replace("**2", "^2").replace("**3", "^3").replace("*", "")
         return f"E : y^2 = {exp_str}"
 
+    def torsion_bound(self, n_primes: int = 6) -> int:
+        """
+        Returns a multiple of the size of the torsion subgroup. For every
+        odd prime p of good reduction, the torsion subgroup injects into
+        the points of E mod p, so its size divides the gcd of #E(F_p)
+        over the first n_primes good primes in TORSION_BOUND_PRIMES.
+        """
+        if self._torsion_bound is not None:
+            return self._torsion_bound
+        from .counting_points_mod_p import number_of_points_mod_p
+
+        bound, primes_used = 0, 0
+        for p in TORSION_BOUND_PRIMES:
+            if self.discriminant % p == 0:
+                continue
+            bound = gcd(bound, number_of_points_mod_p(self.a, self.b, self.c, p))
+            primes_used += 1
+            if bound == 1 or primes_used == n_primes:
+                break
+        # Without good primes, fall back to the lcm of Mazur's group sizes
+        self._torsion_bound = bound if bound != 0 else lcm(*MAZUR_TORSION_SIZES)
+        return self._torsion_bound
+
     def get_order_of(self, p: Point) -> int | None:
         """
         Returns the order of p. By Mazur's theorem, the
@@ -79,35 +183,141 @@ class EllipticCurve:
         It assumes p is a point in the curve.
         If the point has infinite order, returns None.
         """
-        assert self.is_on_the_curve(p)
-        current_point, order = p, 1
-        while not current_point.is_neutral_element():
-            if order > 12 or not current_point.is_integer():
+        if self.is_validating():
+            assert self.is_on_the_curve(p)
+        return self._get_order_of(p)
+
+    def _get_order_of(self, p: Point) -> int | None:
+        """Same as get_order_of, without checking that p is on the curve"""
+        multiples = self._multiples_of(p)
+        return None if multiples is None else len(multiples)
+
+    def _multiples_of(self, p: Point) -> list[Point] | None:
+        """
+        Returns the list [p, 2p, ..., np] where n is the order of p,
+        so that the last element is O. If p has infinite order, returns
+        None. It assumes p is a point in the curve.
+        """
+        multiples = [p]
+        max_order = self._max_torsion_order()
+        while not multiples[-1].is_neutral_element():
+            if len(multiples) > max_order or not multiples[-1].is_integer():
                 # Found infinite order point
                 self._has_point_of_infinite_order = True
                 return None
-            current_point = self.add(current_point, p)
-            order += 1
-        return order
+            multiples.append(self._add(multiples[-1], p))
+        return multiples
+
+    def _max_torsion_order(self) -> int:
+        """
+        Returns the greatest order a torsion point can have, i.e. the
+        greatest divisor of the torsion bound allowed by Mazur's theorem.
+        """
+        bound = self.torsion_bound()
+        return max(d for d in MAZUR_POINT_ORDERS if bound % d == 0)
 
     def _calculate_torsionpoint2order(self) -> dict[Point, int]:
+        """
+        Computes all finite order elements and returns a dictionary
+        {element: order}, with the curve's torsion strategy.
+        """
+        strategy = self.torsion_strategy or _torsion_strategy
+        if strategy == "division-polynomials":
+            return self._torsionpoint2order_by_division_polynomials()
+        return self._torsionpoint2order_by_nagell_lutz()
+
+    def _torsionpoint2order_by_nagell_lutz(self) -> dict[Point, int]:
         """
         Implements the algorithm induced by the Nagell-Lutz
         theorem. Computes all finite order elements and returns
-        a dictionary {element: order}.
+        a dictionary {element: order}. Every multiple kP visited
+        while computing the order n of P is stored with its order
+        n/gcd(n, k), so no candidate is walked twice. The search
+        stops early once the torsion bound shows all points were
+        found.
         """
         from ..utils import roots_of, square_divisors_of
 
         point2order: dict[Point, int] = {O: 1}
+        bound = self.torsion_bound()
+        if self._torsion_is_complete(point2order, bound):
+            return point2order
+        infinite_order_points: set[Point] = set()
         a, b, c = self.a, self.b, self.c
-        for y in sorted([0] + list(square_divisors_of(self.discriminant))):
+        # Points with y = 0 have order 2, impossible if the bound is odd
+        ys = [] if bound % 2 else [0]
+        for y in ys + sorted(square_divisors_of(self.discriminant)):
             for x in roots_of(1, a, b, c - y**2):
-                candidate = Point((R(x), R(y)))
-                if order := self.get_order_of(candidate):
-                    point2order[candidate] = order
+                candidate = Point((x, y), self.backend)
+                if candidate in point2order or candidate in infinite_order_points:
+                    continue
+                multiples = self._multiples_of(candidate)
+                if multiples is None:
+                    infinite_order_points.add(candidate)
+                    continue
+                self._record_multiples(point2order, multiples)
+                if self._torsion_is_complete(point2order, bound):
+                    return point2order
+        return point2order
+
+    def _torsionpoint2order_by_division_polynomials(self) -> dict[Point, int]:
+        """
+        Computes all finite order elements from the integer roots of the
+        division polynomials ψ_n, for the maximal orders n allowed by
+        Mazur's theorem and the torsion bound. Torsion points have integer
+        coordinates by Nagell-Lutz, so only integer roots are needed.
+        """
+        from .division_polynomials import torsion_x_coordinates
+
+        point2order: dict[Point, int] = {O: 1}
+        bound = self.torsion_bound()
+        if self._torsion_is_complete(point2order, bound):
+            return point2order
+        orders = [n for n in MAZUR_POINT_ORDERS if n > 1 and bound % n == 0]
+        maximal_orders = [
+            n for n in orders if not any(m != n and m % n == 0 for m in orders)
+        ]
+        a, b, c = self.a, self.b, self.c
+        xs = torsion_x_coordinates(a, b, c, self.discriminant, maximal_orders)
+        for x in sorted(xs):
+            y_squared = x**3 + a * x**2 + b * x + c
+            y = isqrt(y_squared) if y_squared >= 0 else -1
+            if y * y != y_squared:
+                continue  # The point is not rational
+            for candidate in [
+                Point((x, y), self.backend),
+                Point((x, -y), self.backend),
+            ]:
+                if candidate in point2order:
                     continue
+                if multiples := self._multiples_of(candidate):
+                    self._record_multiples(point2order, multiples)
         return point2order
 
+    @staticmethod
+    def _record_multiples(point2order: dict[Point, int], multiples: list[Point]):
+        """
+        Stores the order n/gcd(n, k) of each kP, given
+        the list of multiples [P, 2P, ..., nP = O].
+        """
+        order = len(multiples)
+        for k, multiple in enumerate(multiples, 1):
+            point2order[multiple] = order // gcd(order, k)
+
+    @staticmethod
+    def _torsion_is_complete(point2order: dict[Point, int], bound: int) -> bool:
+        """
+        Checks if the points found must be the whole torsion subgroup,
+        i.e. no group size allowed by Mazur's theorem is larger than the
+        number of points found, divides the torsion bound and is divisible
+        by the order of every point found.
+        """
+        n_found, orders_lcm = len(point2order), lcm(*point2order.values())
+        return not any(
+            size > n_found and bound % size == 0 and size % orders_lcm == 0
+            for size in MAZUR_TORSION_SIZES
+        )
+
     def _calculate_torsion_name(self) -> str:
         """
         Receives the full list of orders of the group as input
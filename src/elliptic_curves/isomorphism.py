@@ -0,0 +1,51 @@
+"""
+This module implements a reduction of the curves E : y² = x³ + ax² + bx + c
+to a canonical representative of their isomorphism class over Q. Two
+changes of variables preserve the integrality of the coefficients:
+
+- the translation x -> x + t, which takes (a, b, c) to
+  (a + 3t, b + 2at + 3t², c + bt + at² + t³),
+- the scaling (x, y) -> (x/u², y/u³), which takes (a, b, c) to
+  (a/u², b/u⁴, c/u⁶) whenever these are integers.
+
+Isomorphic curves share their torsion subgroup, so results computed
+for the canonical form are valid for every curve reducing to it.
+"""
+
+from math import gcd
+
+from ..utils.rational_integers import factorization_of, valuation
+
+
+def translate(a: int, b: int, c: int, t: int) -> tuple[int, int, int]:
+    """Returns the coefficients after the change of variables x -> x + t"""
+    return a + 3 * t, b + 2 * a * t + 3 * t**2, c + b * t + a * t**2 + t**3
+
+
+def scaling_factor(a: int, b: int, c: int) -> int:
+    """Returns the greatest u > 0 such that u² | a, u⁴ | b and u⁶ | c"""
+    g = gcd(a, b, c)
+    if g == 0:
+        return 1
+    u = 1
+    for p, _ in factorization_of(g):
+        k = min(
+            valuation(coefficient, p) // power
+            for coefficient, power in [(a, 2), (b, 4), (c, 6)]
+            if coefficient != 0
+        )
+        u *= p**k
+    return u
+
+
+def canonical_form(a: int, b: int, c: int) -> tuple[int, int, int]:
+    """
+    Reduces a to {-1, 0, 1} by a translation and removes the
+    scaling factor, repeating until neither changes the curve.
+    """
+    while True:
+        a, b, c = translate(a, b, c, -((a + 1) // 3))
+        u = scaling_factor(a, b, c)
+        if u == 1:
+            return a, b, c
+        a, b, c = a // u**2, b // u**4, c // u**6
@@ -0,0 +1,139 @@
+"""
+This module implements the group law of E : y² = x³ + ax² + bx + c in
+Jacobian coordinates, where the affine point (x, y) is represented by
+integers (X, Y, Z) with x = X/Z² and y = Y/Z³. The point at infinity is
+any triple with Z = 0. Since the coordinates are integers, doubling and
+adding never perform a rational inversion, and the conversion back to an
+affine point only happens once at the end of a scalar multiplication.
+"""
+
+from fractions import Fraction
+
+from .arithmetic import ArithmeticBackend
+from .point import O, Point
+
+
+class JacobianPoint:
+    def __init__(self, X: int, Y: int, Z: int):
+        self.X, self.Y, self.Z = X, Y, Z
+
+    def is_neutral_element(self) -> bool:
+        return self.Z == 0
+
+    def neg(self) -> "JacobianPoint":
+        return JacobianPoint(self.X, -self.Y, self.Z)
+
+    def __str__(self) -> str:
+        return f"({self.X} : {self.Y} : {self.Z})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+INFINITY = JacobianPoint(1, 1, 0)
+
+
+def to_jacobian(p: Point) -> JacobianPoint:
+    """
+    Converts an affine point into integer Jacobian coordinates. If
+    x = u/v and y = w/t, then Z = vt gives integers X = xZ², Y = yZ³.
+    """
+    if p.is_neutral_element():
+        return INFINITY
+    x_num, x_den = p.backend.numerator_and_denominator(p.x)
+    y_num, y_den = p.backend.numerator_and_denominator(p.y)
+    Z = x_den * y_den
+    return JacobianPoint(x_num * y_den**2 * x_den, y_num * x_den**3 * y_den**2, Z)
+
+
+def from_jacobian(p: JacobianPoint, backend: ArithmeticBackend) -> Point:
+    """Converts Jacobian coordinates back to an affine point"""
+    if p.is_neutral_element():
+        return O
+    Z2 = p.Z * p.Z
+    return Point((Fraction(p.X, Z2), Fraction(p.Y, Z2 * p.Z)), backend)
+
+
+def jacobian_double(p: JacobianPoint, a: int, b: int) -> JacobianPoint:
+    """
+    Doubles p on y² = x³ + ax² + bx + c. With M = 3X² + 2aXZ² + bZ⁴
+    the slope is M/(2YZ), which is used as the new Z coordinate.
+    """
+    if p.is_neutral_element() or p.Y == 0:
+        return INFINITY
+    X, Y, Z = p.X, p.Y, p.Z
+    Z2 = Z * Z
+    Y2 = Y * Y
+    M = 3 * X * X + 2 * a * X * Z2 + b * Z2 * Z2
+    Z3 = 2 * Y * Z
+    XY2 = X * Y2
+    X3 = M * M - 4 * a * Y2 * Z2 - 8 * XY2
+    Y3 = M * (4 * XY2 - X3) - 8 * Y2 * Y2
+    return JacobianPoint(X3, Y3, Z3)
+
+
+def jacobian_add(
+    p_1: JacobianPoint, p_2: JacobianPoint, a: int, b: int
+) -> JacobianPoint:
+    """Adds p_1 and p_2 on y² = x³ + ax² + bx + c"""
+    if p_1.is_neutral_element():
+        return p_2
+    if p_2.is_neutral_element():
+        return p_1
+    Z1Z1, Z2Z2 = p_1.Z * p_1.Z, p_2.Z * p_2.Z
+    U1, U2 = p_1.X * Z2Z2, p_2.X * Z1Z1
+    S1, S2 = p_1.Y * Z2Z2 * p_2.Z, p_2.Y * Z1Z1 * p_1.Z
+    H, r = U2 - U1, S2 - S1
+    if H == 0:
+        return jacobian_double(p_1, a, b) if r == 0 else INFINITY
+    H2 = H * H
+    H3 = H2 * H
+    Z3 = p_1.Z * p_2.Z * H
+    X3 = r * r - a * Z3 * Z3 - (U1 + U2) * H2
+    Y3 = r * (U1 * H2 - X3) - S1 * H3
+    return JacobianPoint(X3, Y3, Z3)
+
+
+def wnaf(n: int, width: int) -> list[int]:
+    """
+    Returns the width-w non-adjacent form of n >= 0, least significant
+    digit first. Every non-zero digit is odd and smaller than 2^(w-1)
+    in absolute value, and any w consecutive digits contain at most
+    one non-zero digit.
+    """
+    digits: list[int] = []
+    modulus, half = 1 << width, 1 << (width - 1)
+    while n > 0:
+        if n & 1:
+            digit = n & (modulus - 1)
+            if digit >= half:
+                digit -= modulus
+            n -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        n >>= 1
+    return digits
+
+
+def jacobian_multiply(
+    p: JacobianPoint, n: int, a: int, b: int, width: int = 4
+) -> JacobianPoint:
+    """Computes np with the windowed NAF double-and-add method"""
+    if n < 0:
+        p, n = p.neg(), -n
+    if n == 0 or p.is_neutral_element():
+        return INFINITY
+    # Odd multiples p, 3p, 5p, ..., (2^(w-1) - 1)p
+    double_p = jacobian_double(p, a, b)
+    odd_multiples = [p]
+    for _ in range((1 << (width - 2)) - 1):
+        odd_multiples.append(jacobian_add(odd_multiples[-1], double_p, a, b))
+    result = INFINITY
+    for digit in reversed(wnaf(n, width)):
+        result = jacobian_double(result, a, b)
+        if digit > 0:
+            result = jacobian_add(result, odd_multiples[digit // 2], a, b)
+        elif digit < 0:
+            result = jacobian_add(result, odd_multiples[-digit // 2].neg(), a, b)
+    return result
@@ -1,47 +1,61 @@
 from typing import Any, Literal
 
-import sympy
-from sympy import Rational
+from .arithmetic import ArithmeticBackend, get_backend
+
+Number = Any  # int, Fraction or sympy Rational, depending on the backend
 
 
 class Point:
-    def __init__(self, value: tuple[Rational | int, Rational | int] | Literal["O"]):
-        self._value: tuple[Rational, Rational] | Literal["O"] = "O"
+    def __init__(
+        self,
+        value: tuple[Number, Number] | Literal["O"],
+        backend: str | ArithmeticBackend | None = None,
+    ):
+        self._backend = get_backend(backend)
+        self._value: tuple[Number, Number] | Literal["O"] = "O"
         if value != "O":
-            x, y = value[0], value[1]
-            x_rational = Rational(x, 1) if isinstance(x, int) else x
-            y_rational = Rational(y, 1) if isinstance(y, int) else y
-            self._value = (x_rational, y_rational)
+            convert = self._backend.convert
+            self._value = (convert(value[0]), convert(value[1]))
 
     @property
-    def value(self) -> tuple[Rational, Rational] | Literal["O"]:
+    def value(self) -> tuple[Number, Number] | Literal["O"]:
         return self._value
 
     @property
-    def x(self) -> sympy.Rational:
+    def backend(self) -> ArithmeticBackend:
+        return self._backend
+
+    @property
+    def x(self) -> Number:
         assert self.value != "O"
         return self.value[0]
 
     @property
-    def y(self) -> sympy.Rational:
+    def y(self) -> Number:
         assert self.value != "O"
         return self.value[1]
 
     def is_integer(self) -> bool:
         if self.is_neutral_element():
             return True
-        return self.x.is_Integer and self.y.is_Integer
+        return self._backend.is_integer(self.x) and self._backend.is_integer(self.y)
 
     def is_neutral_element(self) -> bool:
         return self.value == "O"
 
+    def to_backend(self, backend: str | ArithmeticBackend) -> "Point":
+        """Returns the same point with coordinates in another backend"""
+        return Point(self.value, backend)
+
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, self.__class__):
             return self.value == other.value
         return False
 
     def __str__(self) -> str:
-        return str(self.value)
+        if self.is_neutral_element():
+            return str(self.value)
+        return f"({self.x}, {self.y})"
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -1,13 +1,40 @@
-from math import ceil, floor, gcd, log
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from fractions import Fraction
+from functools import lru_cache
+from math import ceil, floor, gcd, isqrt, log
+from multiprocessing.synchronize import Event
+from time import perf_counter
+from typing import MutableMapping
 
-from sympy import Rational as R
-from sympy import primerange
+import numpy as np
 
-from ..utils.rational_integers import (remove_square_factors_of,
-                                       square_free_divisors_of)
+from ..utils.polynomials import poly_derivative, poly_evaluate
+from ..utils.rational_integers import (factorization_of, is_padic_square,
+                                       is_square, remove_square_factors_of,
+                                       square_free_divisors_of, valuation)
+from .counting_points_mod_p import legendre_symbol, square_roots_count_mod
 from .elliptic_curve import EllipticCurve, SingularCurveError
+from .isomorphism import scaling_factor
 from .point import O, Point
 
+# Above this prime, squares mod p are recognized by Euler's criterion
+# instead of a table of size p
+SQUARE_TABLE_LIMIT = 2**16
+
+# Wall-clock limit of the candidate being checked, and the event which
+# cancels it from another process
+_deadline: float | None = None
+_cancel_event: Event | None = None
+
+
+def _check_deadline() -> None:
+    """Raises TimeoutError if the candidate being checked is out of time"""
+    if (_deadline is not None and perf_counter() > _deadline) or (
+        _cancel_event is not None and _cancel_event.is_set()
+    ):
+        raise TimeoutError("The candidate ran out of time.")
+
 
 def exists_solution_mod_p_to(p: int, a: int, b_1: int, b_2: int) -> bool:
     """
@@ -16,21 +43,176 @@ def exists_solution_mod_p_to(p: int, a: int, b_1: int, b_2: int) -> bool:
     The corresponding solutions in the integers (if they exist) must be such that
     (M, N, e) are pairwise coprime. This means, in Z/pZ, that only one of these
     three can be zero at the same time.
+
+    This is only a necessary condition for p-adic solutions when p does not
+    divide b_1 b_2: otherwise a solution with M, e coprime may have M = N = 0
+    or e = N = 0 mod p, e.g. (15, 276, 1) for a = -120, b_1 = 2, b_2 = 1926.
+    """
+    return _exists_solution_mod_p(p, a % p, b_1 % p, b_2 % p)
+
+
+@lru_cache(maxsize=2**16)
+def _exists_solution_mod_p(p: int, a: int, b_1: int, b_2: int) -> bool:
+    """
+    Since the equation is homogeneous, (M, N, e) can be scaled so that
+    e = 1, or M = 1 if e = 0. The right-hand side is then a square with
+    N != 0, or zero with M, e != 0, which is read from a table in O(p).
     """
-    # We may assume M, N, e coprime in Z, so at most one can be zero
+    square_roots = square_roots_count_mod(p) if p <= SQUARE_TABLE_LIMIT else None
+
+    def is_nonzero_square(r: int) -> bool:
+        if square_roots is None:
+            return legendre_symbol(r, p) == 1
+        return r != 0 and square_roots[r] > 0
+
+    if is_nonzero_square(b_1):  # (M, e) = (1, 0)
+        return True
     for M in range(p):
-        for N in range(p):
-            if M == 0 and N == 0:
-                continue
-            for e in range(p):
-                if e == 0 and (M == 0 or N == 0):
-                    continue
-                if (N**2) % p == (b_1 * M**4 + a * M**2 * e**2 + b_2 * e**4) % p:
-                    return True
+        if M % 4096 == 0:
+            _check_deadline()
+        value = (b_1 * M**4 + a * M**2 + b_2) % p
+        if is_nonzero_square(value) or (value == 0 and M != 0):
+            return True
     return False
 
 
-def exists_valid_solution_to(a: int, b_1: int, b_2: int) -> tuple[int, int, int] | None:
+def is_locally_soluble(p: int, a: int, b_1: int, b_2: int) -> bool:
+    """
+    Checks if N^2 = b_1 M^4 + a M^2 e^2 + b_2 e^4 has a non-trivial
+    solution in the p-adic numbers, for p = 2 included. Writing x = M/e,
+    either x or 1/x is a p-adic integer, so it suffices to look for x in
+    Z_p on the quartic and for x in pZ_p on the reversed quartic.
+    """
+    return _is_locally_soluble(p, a, b_1, b_2)
+
+
+@lru_cache(maxsize=2**16)
+def _is_locally_soluble(p: int, a: int, b_1: int, b_2: int) -> bool:
+    return _is_soluble_near(p, [b_2, 0, a, 0, b_1], 0, 0) or _is_soluble_near(
+        p, [b_1, 0, a, 0, b_2], 0, 1
+    )
+
+
+def _is_soluble_near(p: int, g: list[int], x: int, n: int) -> bool:
+    """
+    Checks if g(x') is a p-adic square for some x' = x mod p^n, with g
+    given by its coefficients in increasing order of degree. Each residue class
+    is either decided by Hensel's lemma or split into p classes mod p^(n+1),
+    which terminates as long as g has no repeated roots.
+    """
+    _check_deadline()
+    result = _hensel_lemma(p, g, x, n)
+    if result != 0:
+        return result == 1
+    return any(_is_soluble_near(p, g, x + t * p**n, n + 1) for t in range(p))
+
+
+def _hensel_lemma(p: int, g: list[int], x: int, n: int) -> int:
+    """
+    Returns 1 if g(x') is a p-adic square for some x' = x mod p^n, -1 if
+    it is a square for none of them, and 0 if it can't be decided yet.
+    When x moves by p^n, g(x) moves by p^(n + μ) with μ = v(g'(x)), up
+    to terms in p^(2n), which determines the values reached by g (see
+    Lemmas 6 and 7 of Cremona's Algorithms for Modular Elliptic Curves).
+    """
+    value = poly_evaluate(g, x)
+    if is_padic_square(value, p):
+        return 1
+    derivative = poly_evaluate(poly_derivative(g), x)
+    lam = valuation(value, p)
+    mu = valuation(derivative, p) if derivative != 0 else 2 * n + lam
+    if p != 2:
+        if n > mu and lam >= mu + n:
+            return 1
+        return 0 if mu >= n and lam >= 2 * n else -1
+    odd_part_mod_4 = (value >> lam) % 4
+    if n > mu and (
+        lam >= mu + n
+        or (lam == mu + n - 1 and lam % 2 == 0)
+        or (lam == mu + n - 2 and lam % 2 == 0 and odd_part_mod_4 == 1)
+    ):
+        return 1
+    if mu >= n and (lam >= 2 * n or (lam == 2 * n - 2 and odd_part_mod_4 == 1)):
+        return 0
+    return -1
+
+
+# Squares mod m, used to discard right-hand sides which can't be N²
+SQUARES_MOD = {m: sorted({n * n % m for n in range(m)}) for m in [3, 5, 7, 8]}
+# By default, points of the quartics are searched up to max(|M|, |e|) <= SEARCH_HEIGHT
+SEARCH_HEIGHT = 100
+
+# Greatest height searched so far on each quartic without finding a point,
+# keyed by "a_b1_b2", so that searching with a bigger budget resumes there
+_searched_heights: MutableMapping[str, int] = {}
+
+
+def set_searched_heights(heights: MutableMapping[str, int]) -> None:
+    """
+    Replaces the heights searched on each quartic, e.g. by ones loaded
+    from disk or by a dictionary shared between processes.
+    """
+    global _searched_heights
+    _searched_heights = heights
+
+
+def search_solution_at_height(
+    h: int, a: int, b_1: int, b_2: int
+) -> tuple[int, int, int] | None:
+    """
+    Searches a solution (M, N, e) to N^2 = b_1 M^4 + a M^2 e^2 + b_2 e^4
+    with M >= 0, e > 0 coprime and max(M, e) = h, which covers every
+    solution up to signs and common factors. The right-hand sides of all
+    such pairs are evaluated together, and only the non-negative ones
+    which are squares mod 3, 5, 7 and 8 are tested with isqrt.
+    """
+    M = np.concatenate([np.full(h, h), np.arange(h)])
+    e = np.concatenate([np.arange(1, h + 1), np.full(h, h)])
+    coprime = np.gcd(M, e) == 1
+    M, e = M[coprime], e[coprime]
+    if (abs(b_1) + abs(a) + abs(b_2)) * h**4 >= 2**62:
+        M, e = M.astype(object), e.astype(object)  # Avoids overflowing int64
+    M2, e2 = M * M, e * e
+    rhs = b_1 * M2 * M2 + a * M2 * e2 + b_2 * e2 * e2
+    candidates = rhs >= 0
+    for m, squares in SQUARES_MOD.items():
+        candidates &= np.isin(rhs % m, squares)
+    for i in np.flatnonzero(candidates):
+        N = isqrt(int(rhs[i]))
+        if N * N == rhs[i]:
+            return int(M[i]), N, int(e[i])
+    return None
+
+
+def has_real_solution(a: int, b_1: int, b_2: int) -> bool:
+    """
+    Checks if N^2 = b_1 M^4 + a M^2 e^2 + b_2 e^4 has a non-trivial real
+    solution. If b_1, b_2 < 0, the quadratic b_1 t^2 + a t + b_2 must
+    reach 0 for some t = M^2/e^2 > 0.
+    """
+    return b_1 > 0 or b_2 > 0 or (a > 0 and a**2 >= 4 * b_1 * b_2)
+
+
+def relevant_primes(a: int, b: int) -> list[int]:
+    """
+    Returns the primes dividing 2b(a^2 - 4b). At any other prime, the
+    quartics N^2 = b_1 M^4 + a M^2 e^2 + b_2 e^4 with b_1 b_2 = b have
+    good reduction, and are therefore always locally soluble. The
+    factors are taken separately, so that each stays within the sieve.
+    """
+    primes = {2} | {p for n in [b, a**2 - 4 * b] for p, _ in factorization_of(n)}
+    return sorted(primes)
+
+
+def exists_valid_solution_to(
+    a: int,
+    b_1: int,
+    b_2: int,
+    primes: list[int] | None = None,
+    timeout: float | None = None,
+    timings: dict[str, float] | None = None,
+    max_height: int = SEARCH_HEIGHT,
+) -> tuple[int, int, int] | None:
     """
     Tries to check if there exists an integer solution (M, N, e) to the
     diophantine equation N^2 = b_1 M^4 + a M^2 e^2 + b_2 e^4 such that
@@ -38,74 +220,428 @@ def exists_valid_solution_to(a: int, b_1: int, b_2: int) -> tuple[int, int, int]
     - gcd(M, e) = gcd(N, e) = gcd(M, N) = gcd(b_1, e) = gcd(b_2, M) = 1
 
     If it exists, returns the solution. If it doesn't exist, returns
-    None. If it's inconclusive, raises TimeoutError.
+    None. If the equation is locally soluble at the reals and at the
+    given primes (by default, the relevant_primes), so that b_1 is in
+    the Selmer group, but no solution was found, raises TimeoutError.
+    The p-adic solubility is checked before searching for solutions,
+    which goes through the heights from the last one searched on this
+    quartic up to max_height, stopping after the given number of
+    seconds, if any. Every stage stops at this deadline, raising
+    TimeoutError. The seconds spent in each stage are added to the
+    given timings.
     """
     # print(f"Checking for b_1 = {b_1} and b_2 = {b_2}")
-    if b_1 <= 0 and a <= 0 and b_2 <= 0:
-        # No solutions in the reals!
-        return None
-    for e in range(-100, 100, 1):
-        if e == 0:
-            continue
-        for M in range(-100, 100, 1):
-            for N in range(-100, 100, 1):
-                if N**2 == b_1 * M**4 + a * M**2 * e**2 + b_2 * e**4:
-                    return (M, N, e)
-    # Checking if solution DOESN'T exist mod p
-    for p in primerange(0, 1000):
-        if not exists_solution_mod_p_to(p, a, b_1, b_2):
-            # There is no solution mod p!
+    global _deadline
+    clock = perf_counter()
+    _deadline = None if timeout is None else clock + timeout
+    try:
+        primes = relevant_primes(a, b_1 * b_2) if primes is None else primes
+        # Checking if there are no solutions in the reals or p-adic numbers,
+        # discarding the cheap cases mod p first
+        try:
+            soluble = has_real_solution(a, b_1, b_2) and all(
+                (b_1 * b_2 % p == 0 or exists_solution_mod_p_to(p, a, b_1, b_2))
+                and is_locally_soluble(p, a, b_1, b_2)
+                for p in primes
+            )
+        finally:
+            clock = _record_time(timings, "local", clock)
+        if not soluble:
             return None
+        key = f"{a}_{b_1}_{b_2}"
+        searched_height = _searched_heights.get(key, 0)
+        try:
+            for h in range(searched_height + 1, max_height + 1):
+                _check_deadline()
+                if solution := search_solution_at_height(h, a, b_1, b_2):
+                    _searched_heights.pop(key, None)
+                    return solution
+                searched_height = h
+        except TimeoutError:
+            pass
+        finally:
+            _record_time(timings, "search", clock)
+        if searched_height > 0:
+            _searched_heights[key] = searched_height
+    finally:
+        _deadline = None
     raise TimeoutError(
         f":( Unable to determine if solution exists to equation N^2 = {b_1}M^4 + {a}M^2e^2 + {b_2}e^4."
     )
 
 
-def image_of_alpha(a: int, b: int) -> tuple[dict[Point, int], int]:
+def _record_time(timings: dict[str, float] | None, stage: str, start: float) -> float:
+    """Adds the seconds since start to the stage, and returns the current time"""
+    now = perf_counter()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + now - start
+    return now
+
+
+def _check_candidate(
+    a: int,
+    b_1: int,
+    b_2: int,
+    primes: list[int],
+    timeout: float | None,
+    max_height: int,
+    searched_height: int | None = None,
+) -> tuple[tuple[int, int, int] | None, bool, dict[str, float], int | None]:
+    """
+    Runs exists_valid_solution_to, returning the solution, whether it
+    timed out, the timings and the height searched, so that it can run
+    in another process, which is given the height searched so far.
+    """
+    if searched_height is not None:
+        _searched_heights[f"{a}_{b_1}_{b_2}"] = searched_height
+    timings: dict[str, float] = {}
+    try:
+        solution = exists_valid_solution_to(
+            a, b_1, b_2, primes, timeout, timings, max_height
+        )
+    except TimeoutError:
+        searched_height = _searched_heights.get(f"{a}_{b_1}_{b_2}")
+        return None, True, timings, searched_height
+    return solution, False, timings, None
+
+
+# Pool checking the candidates of calculate_image_of_alpha in parallel
+_executor: ProcessPoolExecutor | None = None
+_executor_processes = 0
+
+
+def _set_cancel_event(event: Event) -> None:
+    global _cancel_event
+    _cancel_event = event
+
+
+def _candidate_executor(n_processes: int) -> ProcessPoolExecutor:
+    """
+    Returns the pool of processes checking the candidates, which is
+    shared by every call with the same number of processes. Its workers
+    stop their running candidates when the cancel event is set.
+    """
+    global _executor, _executor_processes
+    if _executor is None or _executor_processes != n_processes:
+        if _executor is not None:
+            _executor.shutdown()
+        event = multiprocessing.Event()
+        _set_cancel_event(event)
+        _executor = ProcessPoolExecutor(
+            n_processes, initializer=_set_cancel_event, initargs=(event,)
+        )
+        _executor_processes = n_processes
+    return _executor
+
+
+# Images of alpha of the normalized curves, keyed by "a_b", as a list of
+# [value, x, y] with the coordinates as strings (None for O), the bound,
+# the candidates which could not be decided, and whether the image is
+# final, i.e. it doesn't depend on a search cut short by the budget
+_image_of_alpha_cache: MutableMapping[str, tuple[list, int, list[int], bool]] = {}
+
+
+def set_image_of_alpha_cache(
+    cache: MutableMapping[str, tuple[list, int, list[int], bool]],
+) -> None:
+    """
+    Replaces the cache of image_of_alpha, e.g. by one loaded from disk
+    or by a dictionary shared between processes.
+    """
+    global _image_of_alpha_cache
+    _image_of_alpha_cache = cache
+
+
+def normalized_coefficients(a: int, b: int) -> tuple[int, int, int]:
+    """
+    Returns (a/u^2, b/u^4, u) for the greatest such integer u. The change
+    of variables (x, y) -> (x/u^2, y/u^3) takes E : y^2 = x^3 + ax^2 + bx
+    to the normalized curve, and preserves the image of alpha.
+    """
+    u = scaling_factor(a, b, 0)
+    return a // u**2, b // u**4, u
+
+
+def _is_cached(key: str, a: int, b: int, max_height: int) -> bool:
+    """
+    Checks if the cached image of the normalized curve can be reused
+    with the given budget. Entries without the final flag were saved
+    before it was introduced, and are calculated again.
+    """
+    entry = _image_of_alpha_cache.get(key)
+    if entry is None or len(entry) < 4:
+        return False
+    _, _, unresolved, final = entry
+    return final or all(
+        _searched_heights.get(f"{a}_{b_1}_{b // b_1}", 0) >= max_height
+        for b_1 in unresolved
+    )
+
+
+def image_of_alpha(
+    a: int,
+    b: int,
+    n_processes: int = 1,
+    timeout: float | None = None,
+    timings: dict[str, float] | None = None,
+    max_height: int = SEARCH_HEIGHT,
+) -> tuple[dict[Point, int], int, list[int]]:
+    """
+    Same as calculate_image_of_alpha, but isomorphic curves are only
+    calculated once. The images are cached for the normalized curve,
+    and their points are scaled back to the given one. A cached image
+    which is not final is calculated again, resuming the searches of
+    its undecided candidates, unless they were all searched up to
+    max_height.
+    """
+    a_0, b_0, u = normalized_coefficients(a, b)
+    key = f"{a_0}_{b_0}"
+    if not _is_cached(key, a_0, b_0, max_height):
+        image, bound, unresolved = calculate_image_of_alpha(
+            a_0, b_0, n_processes, timeout, timings, max_height
+        )
+        _image_of_alpha_cache[key] = (
+            [
+                (
+                    [value, None, None]
+                    if point.is_neutral_element()
+                    else [value, str(point.x), str(point.y)]
+                )
+                for point, value in image.items()
+            ],
+            bound,
+            unresolved,
+            not unresolved,
+        )
+    cached_image, bound, unresolved, _ = _image_of_alpha_cache[key]
+    image: dict[Point, int] = {}
+    for value, x, y in cached_image:
+        if x is None:
+            image[O] = value
+        else:
+            image[Point((u**2 * Fraction(x), u**3 * Fraction(y)))] = value
+    return image, bound, list(unresolved)
+
+
+def _extend_image(
+    curve: EllipticCurve, image: dict[int, Point], value: int, point: Point
+) -> None:
+    """
+    Adds alpha(point) = value to the image, given as {value: point},
+    together with its products with every value already in it. Since
+    alpha is a homomorphism, alpha(P + Q) = alpha(P) alpha(Q) modulo
+    squares, so the image stays a group and its size a power of two.
+    """
+    for other_value, other_point in list(image.items()):
+        product = remove_square_factors_of(value * other_value)
+        image[product] = curve.add(point, other_point)
+
+
+def _is_pinned_down(image: dict[int, Point], undecided: set[int]) -> bool:
+    """
+    The image is a group containing the one found, so it is exactly
+    the found one unless there are enough undecided candidates to
+    double it.
+    """
+    return len(undecided - image.keys()) < len(image)
+
+
+def calculate_image_of_alpha(
+    a: int,
+    b: int,
+    n_processes: int = 1,
+    timeout: float | None = None,
+    timings: dict[str, float] | None = None,
+    max_height: int = SEARCH_HEIGHT,
+) -> tuple[dict[Point, int], int, list[int]]:
     """
     Tries to calculate all elements in the image of the map
     alpha, whose domain are the points on the elliptic
     curve E : y^2 = x^3 + ax^2 + bx.
 
-    Returns a tuple (D, s). D is a dictionary of pairs
+    Returns a tuple (D, s, U). D is a dictionary of pairs
     {point: value} where alpha(point) = value. The value
     s is an upper bound for the size of the image (based
-    on the number of equations whose solution was not found).
+    on the number of equations whose solution was not found),
+    which is the size of the 2-Selmer group, and U is the
+    list of candidates b_1 which could not be decided.
+
+    Each candidate is checked for at most timeout seconds, and
+    searches for solutions up to max_height. With several
+    processes, the candidates are checked concurrently on a
+    shared pool, and the remaining ones are cancelled as soon
+    as they can no longer change the size of the image.
+    The seconds spent by the candidates in each stage are
+    added to the given timings.
     """
-    points_on_image: dict[Point, int] = {O: 1}
-    missed_points = 0
+    curve = EllipticCurve(a, b, 0)
+    image: dict[int, Point] = {1: O}
     b_no_squares = remove_square_factors_of(b)
-    if b_no_squares not in points_on_image.values():
-        points_on_image[Point((R(0), R(0)))] = b_no_squares
-    candidates_for_image = square_free_divisors_of(b)
-    for b_1 in candidates_for_image:
-        b_2 = b // b_1
+    if b_no_squares not in image:
+        _extend_image(curve, image, b_no_squares, Point((0, 0)))
+    # The other points of order 2 are the solutions with N = 0
+    discriminant = a**2 - 4 * b
+    if is_square(discriminant):
+        for x in {(-a + isqrt(discriminant)) // 2, (-a - isqrt(discriminant)) // 2}:
+            value = remove_square_factors_of(x)
+            if value not in image:
+                _extend_image(curve, image, value, Point((x, 0)))
+    primes = relevant_primes(a, b)
+    pending = sorted(square_free_divisors_of(b) - image.keys(), key=abs)
+    unresolved: set[int] = set()
+
+    def decide(
+        b_1: int,
+        solution: tuple[int, int, int] | None,
+        timed_out: bool,
+        candidate_timings: dict[str, float],
+        searched_height: int | None,
+    ) -> None:
+        if searched_height is not None:
+            _searched_heights[f"{a}_{b_1}_{b // b_1}"] = searched_height
+        if timings is not None:
+            for stage, seconds in candidate_timings.items():
+                timings[stage] = timings.get(stage, 0.0) + seconds
+        if timed_out:
+            unresolved.add(b_1)
+        elif solution and b_1 not in image:
+            M, N, e = solution
+            point = Point((Fraction(b_1 * M**2, e**2), Fraction(b_1 * M * N, e**3)))
+            _extend_image(curve, image, b_1, point)
+
+    if n_processes > 1:
+        executor = _candidate_executor(n_processes)
+        futures = {
+            executor.submit(
+                _check_candidate,
+                a,
+                b_1,
+                b // b_1,
+                primes,
+                timeout,
+                max_height,
+                _searched_heights.get(f"{a}_{b_1}_{b // b_1}", 0),
+            ): b_1
+            for b_1 in pending
+        }
+        undecided = set(pending)
         try:
-            if solution := exists_valid_solution_to(a, b_1, b_2):
-                M, N, e = solution
-                point = Point((R(b_1 * M**2, e**2), R(b_1 * M * N, e**3)))
-                if b_1 not in points_on_image.values():
-                    points_on_image[point] = b_1
-        except:
-            missed_points += 1
-    return points_on_image, len(points_on_image) + missed_points
+            for future in as_completed(futures):
+                b_1 = futures[future]
+                undecided.remove(b_1)
+                decide(b_1, *future.result())
+                if _is_pinned_down(image, undecided | unresolved):
+                    break
+        finally:
+            # The candidates not started are cancelled, and the running
+            # ones stop at their next check of the deadline
+            for future in futures:
+                future.cancel()
+            assert _cancel_event is not None
+            _cancel_event.set()
+            wait(futures)
+            _cancel_event.clear()
+    else:
+        for i, b_1 in enumerate(pending):
+            if _is_pinned_down(image, set(pending[i:]) | unresolved):
+                break
+            if b_1 in image:
+                continue
+            decide(
+                b_1, *_check_candidate(a, b_1, b // b_1, primes, timeout, max_height)
+            )
+    if _is_pinned_down(image, unresolved):
+        unresolved = set()
+    unresolved -= image.keys()
+    points_on_image = {point: value for value, point in image.items()}
+    return points_on_image, len(image) + len(unresolved), sorted(unresolved, key=abs)
 
 
-def calculate_rank(curve: EllipticCurve) -> tuple[int, int]:
+class RankResult:
+    """
+    The result of the 2-descent on E : y² = x³ + ax² + bx. The rank is
+    in [lower, upper]. The images of alpha and alpha bar are given as
+    {point: value}, with the bounds for their sizes and the candidates
+    which could not be decided. The timings are the seconds spent in
+    each stage: "local" for the real, p-adic and mod p eliminations,
+    "search" for the search of points on the quartics, and "total".
+    Unpacks as (lower, upper).
+    """
+
+    def __init__(
+        self,
+        lower: int,
+        upper: int,
+        images: tuple[dict[Point, int], dict[Point, int]],
+        bounds: tuple[int, int],
+        unresolved: tuple[list[int], list[int]],
+        timings: dict[str, float],
+    ) -> None:
+        self.lower, self.upper = lower, upper
+        self.images = images
+        self.bounds = bounds
+        self.unresolved = unresolved
+        self.timings = timings
+
+    def is_exact(self) -> bool:
+        return self.lower == self.upper
+
+    def __iter__(self):
+        return iter((self.lower, self.upper))
+
+    def __str__(self) -> str:
+        lines = [
+            f"Image of alpha{bar} (found {len(image)}, max {bound}):\t{image}"
+            for bar, image, bound in zip(["", " bar"], self.images, self.bounds)
+        ]
+        lines.append(f"Rank is in [{self.lower}, {self.upper}].")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"RankResult(lower={self.lower}, upper={self.upper})"
+
+
+def calculate_rank(
+    curve: EllipticCurve,
+    n_processes: int = 1,
+    timeout: float | None = None,
+    max_height: int = SEARCH_HEIGHT,
+    verbose: bool = False,
+) -> RankResult:
     """
     Tries to calculate the rank of the
     elliptic curve E : y² = x³ + ax² + bx.
 
-    Returns (R, S) where R is a lower-bound for
-    the rank and S is an upper-bound.
+    Returns a RankResult, which unpacks as (R, S)
+    where R is a lower-bound for the rank and S is
+    an upper-bound. The images of alpha are found
+    with the given number of processes, and the
+    points on each quartic are searched up to
+    max_height for at most timeout seconds. The
+    searches of the undecided quartics are resumed
+    by later calls. If verbose, it is printed.
     """
     assert curve.c == 0
+    start = perf_counter()
     a, b = curve.a, curve.b
-    image_1, bound_1 = image_of_alpha(a, b)
-    image_2, bound_2 = image_of_alpha(-2 * a, a**2 - 4 * b)
-    print(f"Image of alpha ({f"found {len(image_1)}, max {bound_1}"}):\t{image_1}")
-    print(f"Image of alpha bar ({f"found {len(image_2)}, max {bound_2}"}):\t{image_2}")
+    timings = {"local": 0.0, "search": 0.0}
+    image_1, bound_1, unresolved_1 = image_of_alpha(
+        a, b, n_processes, timeout, timings, max_height
+    )
+    image_2, bound_2, unresolved_2 = image_of_alpha(
+        -2 * a, a**2 - 4 * b, n_processes, timeout, timings, max_height
+    )
     lower_bound = log(len(image_1), 2) + log(len(image_2), 2) - 2
     upper_bound = log(bound_1, 2) + log(bound_2, 2) - 2
-    print(f"Rank is in [{round(lower_bound, 2)}, {round(upper_bound, 2)}].")
-    return ceil(lower_bound), floor(upper_bound)
+    _record_time(timings, "total", start)
+    result = RankResult(
+        ceil(lower_bound),
+        floor(upper_bound),
+        (image_1, image_2),
+        (bound_1, bound_2),
+        (unresolved_1, unresolved_2),
+        timings,
+    )
+    if verbose:
+        print(result)
+    return result
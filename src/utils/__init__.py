@@ -1,5 +1,6 @@
 from .rational_integers import (
     divisors_of,
+    factorization_of,
     fourth_power_divisors_of,
     is_square_free,
     remove_square_factors_of,
@@ -1,4 +1,4 @@
-from math import ceil, floor, sqrt
+from math import ceil, floor, isqrt, sqrt
 
 from sympy.ntheory import factorint
 
@@ -71,15 +71,24 @@ def gaussian_gcd(a: complex, b: complex) -> complex:
 
 
 def factor_primary_rational_prime(p: int) -> tuple[complex, complex]:
-    """Factors a prime p = 4k+1 into a conjugate prime pair"""
-    for n in range(2, p, 1):
-        if (pow(n, (p - 1) // 2, p) + 1) % p == 0:  # Checking if n^((p-1)/2) = -1 mod p
-            k = (n ** ((p - 1) // 4)) % p  # This k has k^2 = -1 mod p
-            g_prime = gaussian_gcd(p, k + 1j)
-            if is_unit(g_prime):
-                g_prime = gaussian_gcd(p, k - 1j)
-            return (g_prime, conjugate(g_prime))
-    raise Exception("Unknown error.")
+    """
+    Factors a prime p = 4k+1 into a conjugate pair of primary primes.
+    With k² = -1 mod p, the Euclidean algorithm on p and k reaches the
+    first remainder below √p at x, and p = x² + y² (Hermite-Serret).
+    """
+    n = next(n for n in range(2, p) if pow(n, (p - 1) // 2, p) == p - 1)
+    a, b = p, pow(n, (p - 1) // 4, p)  # This b has b^2 = -1 mod p
+    while b * b > p:
+        a, b = b, a % b
+    x, y = b, isqrt(p - b * b)
+    if x * x + y * y != p:
+        raise Exception("Unknown error.")
+    if x % 2 == 0:
+        x, y = y, x
+    if (x + y) % 4 != 1:  # Multiplying by -1 makes x + yi primary
+        x, y = -x, -y
+    g_prime = complex(x, y)
+    return (g_prime, conjugate(g_prime))
 
 
 def factor_gaussian_integer(a: complex) -> dict[complex, int]:
@@ -0,0 +1,114 @@
+"""
+Elementary arithmetic of polynomials with integer coefficients. A polynomial
+is a list of coefficients in increasing order of degree, i.e. [c0, c1, c2]
+stands for c0 + c1x + c2x². The zero polynomial is the empty list.
+"""
+
+from sympy import primerange
+
+
+def poly_normalize(p: list[int]) -> list[int]:
+    """Removes the leading zero coefficients"""
+    while p and p[-1] == 0:
+        p = p[:-1]
+    return p
+
+
+def poly_add(p: list[int], q: list[int]) -> list[int]:
+    if len(p) < len(q):
+        p, q = q, p
+    return poly_normalize([c + (q[i] if i < len(q) else 0) for i, c in enumerate(p)])
+
+
+def poly_sub(p: list[int], q: list[int]) -> list[int]:
+    return poly_add(p, [-c for c in q])
+
+
+def poly_mul(p: list[int], q: list[int]) -> list[int]:
+    if not p or not q:
+        return []
+    product = [0] * (len(p) + len(q) - 1)
+    for i, c in enumerate(p):
+        if c == 0:
+            continue
+        for j, d in enumerate(q):
+            product[i + j] += c * d
+    return poly_normalize(product)
+
+
+def poly_derivative(p: list[int]) -> list[int]:
+    return poly_normalize([i * c for i, c in enumerate(p)][1:])
+
+
+def poly_evaluate(p: list[int], x: int, modulus: int | None = None) -> int:
+    """Evaluates p at x, optionally reducing mod the given modulus"""
+    value = 0
+    for c in reversed(p):
+        value = value * x + c
+        if modulus is not None:
+            value %= modulus
+    return value
+
+
+def integer_roots_in_interval(p: list[int], bound: int) -> set[int]:
+    """
+    Returns all integer roots x of p with |x| <= bound. The roots are
+    found mod a small prime p₀ for which they are all simple, then
+    Hensel lifted until the modulus exceeds 2 bound and checked exactly.
+    The cost depends on the degree, not on the size of the bound.
+    """
+    p = poly_normalize(p)
+    if not p:
+        raise ValueError("The zero polynomial has infinitely many roots.")
+    derivative = poly_derivative(p)
+    for prime in primerange(3, 1000):
+        if p[-1] % prime == 0:
+            continue
+        roots = [r for r in range(prime) if poly_evaluate(p, r, prime) == 0]
+        if any(poly_evaluate(derivative, r, prime) == 0 for r in roots):
+            continue  # Some root is not simple mod this prime
+        integer_roots: set[int] = set()
+        for r in roots:
+            modulus = prime
+            while modulus <= 2 * bound:
+                modulus = modulus * modulus
+                inverse = pow(poly_evaluate(derivative, r, modulus), -1, modulus)
+                r = (r - poly_evaluate(p, r, modulus) * inverse) % modulus
+            x = r if r <= modulus // 2 else r - modulus
+            if abs(x) <= bound and poly_evaluate(p, x) == 0:
+                integer_roots.add(x)
+        return integer_roots
+    # Only happens if p has a repeated factor, check every integer
+    return {x for x in range(-bound, bound + 1) if poly_evaluate(p, x) == 0}
+
+
+def poly_rem(p: list[int], q: list[int], modulus: int) -> list[int]:
+    """Returns the remainder of p divided by q != 0 mod the given prime"""
+    p = poly_normalize([c % modulus for c in p])
+    q = poly_normalize([c % modulus for c in q])
+    inverse = pow(q[-1], -1, modulus)
+    while len(p) >= len(q):
+        factor, shift = p[-1] * inverse % modulus, len(p) - len(q)
+        for i, c in enumerate(q):
+            p[i + shift] = (p[i + shift] - factor * c) % modulus
+        p = poly_normalize(p)
+    return p
+
+
+def poly_pow_mod(p: list[int], n: int, q: list[int], modulus: int) -> list[int]:
+    """Returns p^n mod q and the given prime, by repeated squaring"""
+    result, base = poly_rem([1], q, modulus), poly_rem(p, q, modulus)
+    while n > 0:
+        if n & 1:
+            result = poly_rem(poly_mul(result, base), q, modulus)
+        base = poly_rem(poly_mul(base, base), q, modulus)
+        n >>= 1
+    return result
+
+
+def poly_gcd(p: list[int], q: list[int], modulus: int) -> list[int]:
+    """Returns the greatest common divisor of p and q mod the given prime"""
+    p = poly_normalize([c % modulus for c in p])
+    while q:
+        p, q = q, poly_rem(p, q, modulus)
+    return p
@@ -17,6 +17,9 @@ def quartic_symbol(a: complex, b: complex) -> complex:
     for b_factor, b_factor_power in factor_gaussian_integer(b).items():
         if is_unit(b_factor):
             continue
+        if b_factor.real != 0 and b_factor.imag != 0 and gaussian_norm(b_factor) > 2:
+            output *= quartic_symbol_mod_prime(a, b_factor) ** b_factor_power
+            continue
         exponent = (gaussian_norm(b_factor) - 1) // 4
         curr_output: complex = 1
         for _ in range(exponent):
@@ -25,3 +28,17 @@ def quartic_symbol(a: complex, b: complex) -> complex:
         # output *= mod(mod(a, b_factor) ** exponent, b_factor)
     assert is_unit(output)
     return output
+
+
+def quartic_symbol_mod_prime(a: complex, pi: complex) -> complex:
+    """
+    Computes [a / pi] for a gaussian prime pi = x + yi of prime norm
+    p = 4k+1, not dividing a. Since Z[i]/(pi) is the field with p
+    elements, where i = -x/y, the power a^k is computed mod p.
+    """
+    x, y = int(pi.real), int(pi.imag)
+    p = x * x + y * y
+    i = -x * pow(y, -1, p) % p
+    residue = pow((int(a.real) + int(a.imag) * i) % p, (p - 1) // 4, p)
+    units = {1: 1, p - 1: -1, i: 1j, p - i: -1j}
+    return units[residue]
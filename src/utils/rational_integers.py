@@ -1,28 +1,141 @@
-from math import floor, sqrt
+from functools import lru_cache
+from math import isqrt, prod
 
 import numpy as np
 from sympy import factorint
 
+from .polynomials import poly_evaluate, poly_normalize
+
+FACTORIZATION_CACHE_SIZE = 2**16
+MAX_SIEVE_LIMIT = 10**7  # 40MB of smallest prime factors
+
+_smallest_prime_factor: np.ndarray = np.zeros(0, dtype=np.int32)
+
+
+def smallest_prime_factor_sieve(limit: int) -> np.ndarray:
+    """
+    Returns an array whose n-th entry is the smallest
+    prime factor of n, for 2 <= n <= limit.
+    """
+    sieve = np.zeros(limit + 1, dtype=np.int32)
+    for p in range(2, isqrt(limit) + 1):
+        if sieve[p] == 0:
+            multiples = sieve[p * p :: p]
+            multiples[multiples == 0] = p
+    primes = np.flatnonzero(sieve == 0)
+    sieve[primes] = primes
+    return sieve
+
+
+def install_prime_sieve(limit: int) -> None:
+    """
+    Makes factorization_of use a smallest prime factor sieve
+    for every |n| <= limit, so that those integers are factored
+    in O(log n) steps. Larger integers fall back to factorint.
+    Does nothing if a sieve at least as large is installed.
+    """
+    global _smallest_prime_factor
+    limit = min(limit, MAX_SIEVE_LIMIT)
+    if limit < len(_smallest_prime_factor):
+        return
+    _smallest_prime_factor = smallest_prime_factor_sieve(limit)
+
+
+@lru_cache(maxsize=FACTORIZATION_CACHE_SIZE)
+def factorization_of(n: int) -> tuple[tuple[int, int], ...]:
+    """
+    Returns the prime factorization of |n| as a tuple of pairs
+    (prime, exponent) in increasing order of primes. The result
+    is cached, so that all the divisor functions below share a
+    single factorization per integer. Assumes n is not zero.
+    """
+    n = abs(n)
+    if n >= len(_smallest_prime_factor):
+        return tuple(sorted(factorint(n).items()))
+    factors: list[tuple[int, int]] = []
+    while n > 1:
+        p, e = int(_smallest_prime_factor[n]), 0
+        while n % p == 0:
+            n, e = n // p, e + 1
+        factors.append((p, e))
+    return tuple(factors)
+
+
+def products_of_prime_powers(prime_powers: list[tuple[int, int]]) -> list[int]:
+    """
+    Returns all products of p^k for 0 <= k <= e,
+    given a list of pairs (p, e) of distinct primes.
+    """
+    products = [1]
+    for p, e in prime_powers:
+        powers = [p**k for k in range(e + 1)]
+        products = [d * power for d in products for power in powers]
+    return products
+
+
+def _with_negatives(divisors: list[int]) -> set[int]:
+    return set(divisors).union({-x for x in divisors})
+
+
+def valuation(n: int, p: int) -> int:
+    """Returns the exponent of the prime p in n != 0"""
+    k = 0
+    while n % p == 0:
+        n, k = n // p, k + 1
+    return k
+
 
 def is_square(n: int) -> bool:
     """Checks if n is a square number"""
     if n < 0:
         return False
-    return sqrt(n).is_integer()
+    return isqrt(n) ** 2 == n
+
+
+def is_padic_square(n: int, p: int) -> bool:
+    """
+    Checks if n is a square in the p-adic numbers, i.e. if n = p^(2k)u
+    with u a unit which is a square mod p, or mod 8 if p = 2.
+    """
+    if n == 0:
+        return True
+    k = valuation(n, p)
+    n //= p**k
+    if k % 2 == 1:
+        return False
+    if p == 2:
+        return n % 8 == 1
+    return pow(n, (p - 1) // 2, p) == 1
+
+
+def integer_cube_root(n: int) -> int:
+    """Returns the greatest integer r such that r³ <= n, for n >= 0"""
+    lo, hi = 0, 1 << (n.bit_length() // 3 + 1)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if mid**3 <= n:
+            lo = mid
+        else:
+            hi = mid
+    return lo
 
 
 def divisors_of(n: int) -> set[int]:
     """Returns all divisors of n"""
-    n = abs(n)
-    divisors: set[int] = {1, n}
-    root = sqrt(n)
-    if int(root) == root:
-        divisors.add(int(root))
-    for m in range(2, floor(sqrt(n)) + 1, 1):
-        if n % m == 0:
-            divisors.add(m)
-            divisors.add(n // m)
-    return divisors.union({-x for x in divisors})
+    if n == 0:
+        return {0, 1, -1}
+    return _with_negatives(products_of_prime_powers(list(factorization_of(n))))
+
+
+def power_divisors_of(n: int, k: int) -> set[int]:
+    """
+    Returns all divisors d of n such
+    that d^k still divides n.
+    """
+    if n == 0:
+        return {0, 1, -1}
+    prime_powers = [(p, e // k) for p, e in factorization_of(n) if e >= k]
+    return _with_negatives(products_of_prime_powers(prime_powers))
 
 
 def fourth_power_divisors_of(n: int) -> set[int]:
@@ -30,15 +143,7 @@ def fourth_power_divisors_of(n: int) -> set[int]:
     Returns all divisors d of n such
     that d^4 still divides n.
     """
-    n = abs(n)
-    divisors: set[int] = {1}
-    root = sqrt(sqrt(n))
-    if int(root) == root:
-        divisors.add(int(root))
-    for m in range(2, floor(root) + 1, 1):
-        if n % m**4 == 0:
-            divisors.add(m)
-    return divisors.union({-x for x in divisors})
+    return power_divisors_of(n, 4)
 
 
 def square_divisors_of(n: int) -> set[int]:
@@ -46,53 +151,98 @@ def square_divisors_of(n: int) -> set[int]:
     Returns all divisors d of n such
     that d² still divides n.
     """
-    n = abs(n)
-    divisors: set[int] = {1}
-    root = sqrt(n)
-    if int(root) == root:
-        divisors.add(int(root))
-    for m in range(2, floor(root) + 1, 1):
-        if n % m**2 == 0:
-            divisors.add(m)
-    return divisors.union({-x for x in divisors})
+    return power_divisors_of(n, 2)
 
 
 def is_square_free(n: int) -> bool:
     """Checks if n is a square-free integer"""
-    return square_divisors_of(n) == {1, -1}
+    return n != 0 and all(e == 1 for _, e in factorization_of(n))
 
 
 def is_fourth_power_free(n: int) -> bool:
     """Checks if n is a fourth-power-free integer"""
-    return fourth_power_divisors_of(n) == {1, -1}
+    return n != 0 and all(e < 4 for _, e in factorization_of(n))
 
 
 def square_free_divisors_of(n: int) -> set[int]:
     """Returns all square-free divisors of n"""
-    divisors = divisors_of(n)
-    return set(d for d in divisors if is_square_free(d))
+    if n == 0:
+        return {1, -1}
+    primes = [(p, 1) for p, _ in factorization_of(n)]
+    return _with_negatives(products_of_prime_powers(primes))
 
 
 def remove_square_factors_of(n: int) -> int:
     """Returns n without any square factors"""
-    for d in range(2, abs(n), 1):
-        while n % d**2 == 0:
-            n = n // (d**2)
-    return n
+    if n == 0:
+        return 0
+    sign = 1 if n > 0 else -1
+    return sign * prod(p for p, e in factorization_of(n) if e % 2 == 1)
+
+
+def root_in_monotone_interval(polynomial: list[int], lo: int, hi: int) -> int | None:
+    """
+    Returns the integer root of the polynomial in [lo, hi], assuming
+    the polynomial is monotone in this interval, or None if there is
+    no such root. Uses bisection with exact integer evaluation.
+    """
+    f_lo, f_hi = poly_evaluate(polynomial, lo), poly_evaluate(polynomial, hi)
+    if f_lo == 0:
+        return lo
+    if f_hi == 0:
+        return hi
+    if (f_lo > 0) == (f_hi > 0):
+        return None
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        f_mid = poly_evaluate(polynomial, mid)
+        if f_mid == 0:
+            return mid
+        if (f_mid > 0) == (f_lo > 0):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+    return None
 
 
 def roots_of(a: int, b: int, c: int, d: int) -> set[int]:
     """
     Returns all integer roots of ax³ + bx² + cx + d = 0
-    Makes use of Gauss' Lemma to reduce the number of
-    cases to check.
-    """
-    roots: set[int] = set()
-    if d == 0:
-        return roots_of(0, a, b, c).union({0})
-    for x in divisors_of(abs(d)).union({0}):
-        if a * x**3 + b * x**2 + c * x + d == 0:
-            roots.add(x)
+    The real line is split at the critical points into at most
+    three intervals where the polynomial is monotone, and each
+    of them is searched by bisection, so only O(log) exact
+    evaluations are needed in the size of the coefficients.
+    """
+    polynomial = poly_normalize([d, c, b, a])
+    if not polynomial:
+        raise ValueError("The zero polynomial has infinitely many roots.")
+    degree, leading = len(polynomial) - 1, polynomial[-1]
+    if degree == 0:
+        return set()
+    # Cauchy's bound on the absolute value of the roots
+    bound = 2 + max(abs(k) for k in polynomial[:-1]) // abs(leading)
+    # Integer approximations (up to ±1) of the critical points
+    critical_points: list[int] = []
+    if degree == 2:
+        critical_points = [-polynomial[1] // (2 * leading)]
+    if degree == 3:
+        discriminant = polynomial[2] ** 2 - 3 * leading * polynomial[1]
+        if discriminant > 0:
+            root = isqrt(discriminant)
+            critical_points = [
+                (-polynomial[2] + sign * root) // (3 * leading) for sign in [-1, 1]
+            ]
+    # Integers around critical points are checked directly
+    checkpoints = {-bound, bound}
+    for point in critical_points:
+        checkpoints |= {x for x in range(point - 2, point + 3) if abs(x) <= bound}
+    checkpoints_sorted = sorted(checkpoints)
+    roots = {x for x in checkpoints if poly_evaluate(polynomial, x) == 0}
+    for lo, hi in zip(checkpoints_sorted, checkpoints_sorted[1:]):
+        if hi - lo > 1:
+            root = root_in_monotone_interval(polynomial, lo, hi)
+            if root is not None:
+                roots.add(root)
     return roots
 
 
@@ -101,7 +251,7 @@ def radical(a: int) -> int:
     Returns the radical of a, i.e. the product of all
     primes dividing a.
     """
-    prime_factors = list(factorint(a).keys())
-    output = np.prod(prime_factors)
-    assert output.is_integer()
-    return int(output)
+    if a == 0:
+        return 0
+    sign = 1 if a > 0 else -1
+    return sign * prod(p for p, _ in factorization_of(a))
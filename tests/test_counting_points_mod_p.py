@@ -0,0 +1,26 @@
+from sympy import fraction, primerange
+
+from src.elliptic_curves.counting_points_mod_p import (
+    FNumbers,
+    ModifiedBernoulliNumbers,
+    count_points_mod_p,
+    modified_bernoulli_residue_mod_p,
+)
+
+
+def test_count_points_mod_p_agrees_with_exact_recursion():
+    t2, t3 = 3, 5
+    count = count_points_mod_p(t2, t3, 200)
+    bn, fn = ModifiedBernoulliNumbers(), FNumbers(t2, t3)
+    for p in primerange(19, 200):
+        num, den = fraction(fn.find(p - 1) / bn.find(p - 1))
+        a_p = num * pow(den, -1, p) % p
+        if a_p > (p - 1) // 2:
+            a_p -= p
+        assert count[p] == p + 1 - a_p
+
+
+def test_count_points_mod_p_leaves_out_primes_where_bernoulli_residue_vanishes():
+    assert modified_bernoulli_residue_mod_p(1039) == 0
+    count = count_points_mod_p(3, 5, 1040)
+    assert sorted(count) == [p for p in primerange(19, 1040) if p != 1039]
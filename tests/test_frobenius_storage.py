@@ -0,0 +1,31 @@
+from sympy import primerange
+
+from src.chunk_storage import FrobeniusStorage
+from src.elliptic_curves.counting_points_mod_p import number_of_points_mod_p
+
+curve = (0, -1, -112)
+
+
+def test_iterate_traces_reads_stored_blocks(tmp_path):
+    storage = FrobeniusStorage(tmp_path)
+    first = list(storage.iterate_traces(curve, primerange(3, 2000), block_size=64))
+    again = list(storage.iterate_traces(curve, primerange(3, 2000), block_size=100))
+    assert first == again
+    assert dict((p, a_p) for p, a_p, _ in first) == storage.get_curve_data(curve)
+    for p, a_p, bad in first:
+        if not bad:
+            assert a_p == p + 1 - number_of_points_mod_p(*curve, p)
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    storage = FrobeniusStorage(tmp_path)
+    list(storage.iterate_traces(curve, primerange(3, 500), block_size=32))
+    traces = storage.get_curve_data(curve)
+    path = storage.get_curve_path(curve)
+    content = path.read_bytes()
+    path.write_bytes(content[:-10])
+    lines = content.splitlines()
+    assert len(storage.get_curve_data(curve)) == len(traces) - lines[-1].count(b":")
+    stream = storage.iterate_traces(curve, primerange(3, 500), block_size=32)
+    assert {p: a_p for p, a_p, _ in stream} == traces
+    assert storage.get_curve_data(curve) == traces
@@ -0,0 +1,28 @@
+import pytest
+
+from src.elliptic_curves import EllipticCurve, calculate_rank
+from src.elliptic_curves.rank_calculator import (
+    exists_valid_solution_to,
+    set_image_of_alpha_cache,
+    set_searched_heights,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    set_image_of_alpha_cache({})
+    set_searched_heights({})
+
+
+def test_selmer_element_is_kept_at_prime_dividing_b():
+    # (15, 276, 1) is a solution with M = N = 0 mod 3
+    with pytest.raises(TimeoutError):
+        exists_valid_solution_to(-120, 2, 1926, max_height=3)
+    assert exists_valid_solution_to(-120, 2, 1926) == (15, 276, 1)
+
+
+@pytest.mark.parametrize("a, b", [(60, -63), (75, -63), (-79, -108), (5, 202)])
+def test_rank_with_non_square_free_b_is_not_exactly_zero(a, b):
+    lower, upper = calculate_rank(EllipticCurve(a, b, 0), max_height=3)
+    assert upper >= 1
+    assert calculate_rank(EllipticCurve(a, b, 0)).lower == 1
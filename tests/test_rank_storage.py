@@ -0,0 +1,19 @@
+from src.chunk_storage import RankStorage
+
+
+def test_refine_after_cheap_sweep(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "rank").mkdir(parents=True)
+    storage = RankStorage()
+    storage.chunk_range = [5, 5]
+    storage.search_height = 3
+    storage.store_timings = True
+    storage.calculate_chunk([12, -13])
+    cells = {f"{a}_{b}" for a in range(60, 65) for b in range(-65, -60)}
+    assert set(storage.get_timings([12, -13])) == cells
+    # The Selmer element 2 of (a, b) = (60, -63) needs a search to height 15
+    assert storage.get_chunk_data([12, -13])["0_1"].count([60, -63]) == 1
+    storage.search_height = 100
+    storage.refine()
+    assert [60, -63] in storage.get_chunk_data([12, -13])["1"]
+    assert set(storage.get_timings([12, -13])) == cells